@@ -0,0 +1,71 @@
+"""Benchmark dell'estrattore per densità di testo contro il percorso a selettori.
+
+Su pagine con layout diversi (tema standard, temi con classi sconosciute, testo in
+div senza <p>, anteprime <article> prima del corpo, wrapper '.content' che contiene
+tutta la pagina) confronta velocità e qualità di:
+  - selettori: i selettori 'default' di ArticleScraper con il ripiego sui <p>
+  - densità:   news_agent.content_extractor.extract_main_content
+La qualità è la F1 sulle parole rispetto al testo atteso del corpo.
+
+Uso: python benchmarks/bench_content_extractor.py [numero_pagine]
+"""
+import sys
+import timeit
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from news_agent.article_scraper import ArticleScraper
+from news_agent.content_extractor import extract_main_content
+from news_agent.html_parser import parse_html
+from news_corpus import FIXTURE_LAYOUTS, fixture_pages
+
+def f1(extracted, expected):
+    got = Counter((extracted or "").lower().split())
+    want = Counter(expected.lower().split())
+    common = sum((got & want).values())
+    if not common:
+        return 0.0
+    precision = common / sum(got.values())
+    recall = common / sum(want.values())
+    return 2 * precision * recall / (precision + recall)
+
+def selector_path(scraper, soup):
+    return scraper.extract_content_with_selectors(soup, 'default')
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    pages = fixture_pages(count)
+    scraper = ArticleScraper()
+    soups = [parse_html(html) for _, html, _ in pages]
+    
+    methods = {
+        "selettori": lambda soup: selector_path(scraper, soup),
+        "densità": extract_main_content
+    }
+    
+    print(f"Pagine: {len(pages)}")
+    print(f"{'layout':18}" + "".join(f"{name:>12}" for name in methods))
+    for layout in FIXTURE_LAYOUTS:
+        row = f"{layout:18}"
+        for name, method in methods.items():
+            scores = [f1(method(soup), expected) for soup, (url, _, expected) in zip(soups, pages) if f"/{layout}/" in url]
+            row += f"{sum(scores) / len(scores):>12.2f}"
+        print(row)
+    
+    row = f"{'F1 media':18}"
+    for name, method in methods.items():
+        scores = [f1(method(soup), expected) for soup, (_, _, expected) in zip(soups, pages)]
+        row += f"{sum(scores) / len(scores):>12.2f}"
+    print(row)
+    
+    row = f"{'ms per pagina':18}"
+    for name, method in methods.items():
+        elapsed = min(timeit.repeat(lambda: [method(soup) for soup in soups], number=1, repeat=3))
+        row += f"{elapsed / len(soups) * 1000:>12.2f}"
+    print(row)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark dei backend di parsing HTML usati dagli scraper.
+
+Analizza un corpus di pagine di notizie con html.parser e con il backend scelto
+da news_agent.html_parser (lxml se installato) ed esegue su entrambi gli stessi
+helper di estrazione di ArticleScraper, verificando che il testo estratto coincida.
+Il contenuto è estratto con i soli selettori: extract_content passerebbe dalla
+memoria dei percorsi, che scrive su disco e favorirebbe il secondo backend misurato.
+
+Uso: python benchmarks/bench_html_parser.py [cartella_con_pagine_html]
+"""
+import statistics
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from news_agent.article_scraper import ArticleScraper
+from news_agent.html_parser import HTML_PARSER, parse_html
+from news_corpus import load_pages
+
+REPEAT = 15
+
+def extract_all(scraper, pages, parser):
+    results = []
+    for url, html in pages:
+        soup = parse_html(html, parser)
+        domain = scraper.extract_domain(url)
+        results.append((
+            scraper.extract_title(soup),
+            scraper.extract_content_with_selectors(soup, domain),
+            scraper.extract_date(soup),
+            scraper.extract_author(soup)
+        ))
+    return results
+
+def main():
+    pages = load_pages(sys.argv[1] if len(sys.argv) > 1 else None)
+    scraper = ArticleScraper()
+    total_kb = sum(len(html) for _, html in pages) / 1024
+    print(f"Pagine: {len(pages)} ({total_kb:.0f} KB)")
+    
+    if HTML_PARSER == 'html.parser':
+        print("lxml non installato: viene usato html.parser (pip install lxml per il confronto)")
+    
+    baseline = extract_all(scraper, pages, 'html.parser')
+    fast = extract_all(scraper, pages, HTML_PARSER)
+    mismatches = sum(1 for a, b in zip(baseline, fast) if a != b)
+    
+    # Misure alternate tra i backend, per non favorire quello misurato per secondo
+    timings = {'html.parser': ([], []), HTML_PARSER: ([], [])}
+    for _ in range(REPEAT):
+        for parser, (parse_times, full_times) in timings.items():
+            parse_times.append(timeit.timeit(lambda: [parse_html(html, parser) for _, html in pages], number=1))
+            full_times.append(timeit.timeit(lambda: extract_all(scraper, pages, parser), number=1))
+    
+    for parser, (parse_times, full_times) in timings.items():
+        print(f"{parser:12} parsing: {statistics.median(parse_times) * 1000:7.1f} ms   "
+              f"parsing + estrazione: {statistics.median(full_times) * 1000:7.1f} ms (mediana di {REPEAT})")
+    
+    speedups = sorted(base / fast for base, fast in zip(timings['html.parser'][1], timings[HTML_PARSER][1]))
+    print(f"Speedup ({HTML_PARSER}): {statistics.median(speedups):.2f}x (min {speedups[0]:.2f}x, max {speedups[-1]:.2f}x)")
+    print(f"Estrazioni diverse tra i backend: {mismatches}/{len(pages)}")
+
+if __name__ == "__main__":
+    main()
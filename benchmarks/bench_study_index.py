@@ -0,0 +1,154 @@
+"""Benchmark dell'estrazione dei campi di uno studio con l'indice delle sezioni.
+
+Confronta gli estrattori precedenti di ScientificStudyScraper (una ricerca dei titoli
+per ogni parola chiave, get_text() dell'intera pagina per DOI e peer review,
+decompose() per il testo completo) con una sola visita che costruisce il SectionIndex
+da cui leggono tutti gli estrattori. Mostra anche la lunghezza del testo completo,
+ora limitata dal budget di caratteri: il testo dell'indice deve coincidere con
+l'inizio di quello ricomposto, nello stesso ordine, con le ricerche sull'albero.
+
+Uso: python benchmarks/bench_study_index.py
+"""
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from news_agent.content_extractor import get_content_budget, truncate_text
+from news_agent.html_parser import parse_html
+from news_agent.scientific_study_scraper import (
+    ABSTRACT_SELECTORS, AUTHOR_SELECTORS, BACK_MATTER_KEYWORDS, CONCLUSION_KEYWORDS, DATE_SELECTORS,
+    JOURNAL_SELECTORS, METHODOLOGY_KEYWORDS, PEER_REVIEWED_INDICATORS, PRIORITY_SECTIONS, RESULTS_KEYWORDS,
+    TITLE_SELECTORS, ScientificStudyScraper
+)
+from news_corpus import synthetic_study_page
+
+HEADINGS = ['h1', 'h2', 'h3', 'h4']
+
+def legacy_heading(soup, keywords):
+    """Primo titolo con contenuto che corrisponde alle parole chiave, e il suo contenuto"""
+    for keyword in keywords:
+        for heading in soup.find_all(HEADINGS, string=re.compile(keyword, re.I)):
+            content = []
+            for sibling in heading.find_next_siblings():
+                if sibling.name in HEADINGS:
+                    break
+                if sibling.get_text().strip():
+                    content.append(sibling.get_text().strip())
+            if content:
+                return heading, ' '.join(content[:500])
+    return None, None
+
+def legacy_section(soup, keywords):
+    return legacy_heading(soup, keywords)[1]
+
+def legacy_budgeted_text(soup, budget, abstract):
+    """Testo completo nell'ordine del budget (abstract, sezioni prioritarie, paragrafi), senza il taglio finale"""
+    lead = ' '.join(f"Abstract: {abstract}".split())
+    priority = PRIORITY_SECTIONS[1:]
+    share = budget // (len(priority) + 1)
+    parts = [truncate_text(lead, share)]
+    used = len(parts[0]) + 1
+    taken = []
+    for keywords in priority:
+        if used >= budget:
+            break
+        heading, content = legacy_heading(soup, keywords)
+        if heading is None or heading in taken:
+            continue
+        taken.append(heading)
+        parts.append(f"{' '.join(heading.get_text().split())}: {truncate_text(' '.join(content.split()), min(share, budget - used))}")
+        used += len(parts[-1]) + 1
+    
+    for paragraph in soup.find_all('p'):
+        heading = paragraph.find_previous(HEADINGS)
+        if heading is not None and (heading in taken or any(re.search(keyword, heading.get_text(), re.I)
+                                                            for keyword in BACK_MATTER_KEYWORDS)):
+            continue
+        text = ' '.join(paragraph.get_text().split())
+        if len(text) > 50 and text not in lead:
+            parts.append(text)
+    return ' '.join(parts)
+
+def legacy_first(soup, selectors):
+    for selector in selectors:
+        elem = soup.select_one(selector)
+        if elem:
+            return elem.get_text().strip()
+    return None
+
+def legacy_extract(soup):
+    text = soup.get_text()
+    info = {
+        'title': legacy_first(soup, TITLE_SELECTORS),
+        'authors': [elem.get_text().strip() for selector in AUTHOR_SELECTORS for elem in soup.select(selector)],
+        'abstract': legacy_first(soup, ABSTRACT_SELECTORS),
+        'methodology': legacy_section(soup, METHODOLOGY_KEYWORDS),
+        'results': legacy_section(soup, RESULTS_KEYWORDS),
+        'conclusions': legacy_section(soup, CONCLUSION_KEYWORDS),
+        'publication_date': legacy_first(soup, DATE_SELECTORS),
+        'journal': legacy_first(soup, JOURNAL_SELECTORS),
+        'doi': re.search(r'10\.\d{4,}/[-._;()/:\w]+', text).group(),
+        'peer_reviewed': any(indicator in soup.get_text().lower() for indicator in PEER_REVIEWED_INDICATORS)
+    }
+    for elem in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
+        elem.decompose()
+    info['full_text'] = ' '.join(p.get_text().strip() for p in soup.find_all('p') if len(p.get_text().strip()) > 50)
+    return info
+
+def indexed_extract(scraper, soup):
+    index = scraper._build_index(soup)
+    abstract = scraper._extract_abstract(index)
+    return {
+        'title': scraper._extract_title(index),
+        'authors': scraper._extract_authors(index),
+        'abstract': abstract,
+        'methodology': scraper._extract_methodology(index),
+        'results': scraper._extract_results(index),
+        'conclusions': scraper._extract_conclusions(index),
+        'publication_date': scraper._extract_date(index),
+        'journal': scraper._extract_journal(index),
+        'doi': scraper._extract_doi(index),
+        'peer_reviewed': scraper._is_peer_reviewed(index),
+        'full_text': scraper._extract_full_text(index, abstract)
+    }
+
+def best_time(function, html, repeat=5):
+    # La versione precedente modifica l'albero: ogni misura parte da un albero nuovo
+    best = None
+    for _ in range(repeat):
+        soup = parse_html(html)
+        elapsed = timeit.timeit(lambda: function(soup), number=1)
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    scraper = ScientificStudyScraper()
+    print(f"{'paragrafi':>9} {'nodi':>7} {'precedente':>12} {'indice':>12} {'speedup':>8} {'testo prima':>12} {'testo ora':>10}")
+    for paragraphs in (5, 20, 80, 320):
+        _, html = synthetic_study_page(paragraphs)
+        nodes = sum(1 for _ in parse_html(html).descendants)
+        
+        legacy = legacy_extract(parse_html(html))
+        new = indexed_extract(scraper, parse_html(html))
+        for field in ('title', 'authors', 'abstract', 'publication_date', 'journal', 'doi', 'peer_reviewed'):
+            assert legacy[field] == new[field], field
+        for field in ('methodology', 'results', 'conclusions'):
+            # Le sezioni ora sono limitate dal budget di caratteri: devono coincidere con l'inizio
+            assert ' '.join(legacy[field].split()).startswith(new[field].removesuffix(' […]').rsplit(' ', 1)[0]), field
+        soup = parse_html(html)
+        for elem in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
+            elem.decompose()
+        expected = legacy_budgeted_text(soup, get_content_budget(), legacy['abstract'])
+        assert expected.startswith(new['full_text'].removesuffix(' […]').rsplit(' ', 1)[0]), 'full_text'
+        
+        legacy_time = best_time(legacy_extract, html)
+        new_time = best_time(lambda soup: indexed_extract(scraper, soup), html)
+        print(f"{paragraphs:>9} {nodes:>7} {legacy_time * 1000:>10.2f}ms {new_time * 1000:>10.2f}ms {legacy_time / new_time:>7.1f}x"
+              f" {len(legacy['full_text']):>12} {len(new['full_text']):>10}")
+
+if __name__ == "__main__":
+    main()
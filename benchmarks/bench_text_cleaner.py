@@ -0,0 +1,67 @@
+"""Micro-benchmark della normalizzazione del testo dei feed.
+
+Confronta la catena di re.sub/html.unescape usata in precedenza da fetch_articles
+con news_agent.text_cleaner su alcune migliaia di item sintetici.
+
+Uso: python benchmarks/bench_text_cleaner.py [numero_item]
+"""
+import html
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from news_agent.text_cleaner import normalize_text, normalize_many
+
+def legacy_clean(title, description, author):
+    clean_descr = re.sub('<[^<]+?>', '', description)
+    clean_descr = html.unescape(clean_descr)
+    clean_descr = re.sub(r'&[a-zA-Z0-9#]+;', '', clean_descr)
+    clean_descr = re.sub(r'\s+', ' ', clean_descr)
+    
+    clean_title = html.unescape(title)
+    clean_title = re.sub(r'&[a-zA-Z0-9#]+;', '', clean_title)
+    clean_title = re.sub(r'\s+', ' ', clean_title)
+    
+    clean_author = html.unescape(author)
+    clean_author = re.sub(r'&[a-zA-Z0-9#]+;', '', clean_author)
+    clean_author = re.sub(r'\s+', ' ', clean_author)
+    return clean_title.strip(), clean_descr.strip(), clean_author.strip()
+
+def new_clean(title, description, author):
+    clean_title, clean_author = normalize_many((title, author))
+    return clean_title, normalize_text(description, strip_tags=True), clean_author
+
+def make_items(n):
+    items = []
+    for i in range(n):
+        title = f"Governo, approvata la manovra {i}: cosa cambia per famiglie e imprese"
+        if i % 3 == 0:
+            title = f"L&#39;Italia e l&apos;Europa: vertice n. {i} &amp; nuove regole"
+        description = (
+            f'<p>Il Consiglio dei ministri ha approvato <b>il testo</b> n. {i}.</p>\n'
+            f'<a href="https://example.com/{i}">Leggi tutto</a> &nbsp;&raquo;  '
+            'Le misure riguardano   fisco, lavoro e pensioni.'
+        )
+        author = "ANSA" if i % 2 else "Redazione &amp; Agenzie"
+        items.append((title, description, author))
+    return items
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    items = make_items(n)
+    
+    assert [legacy_clean(*item) for item in items] == [new_clean(*item) for item in items]
+    
+    legacy = min(timeit.repeat(lambda: [legacy_clean(*item) for item in items], number=1, repeat=5))
+    new = min(timeit.repeat(lambda: [new_clean(*item) for item in items], number=1, repeat=5))
+    
+    print(f"Item: {n}")
+    print(f"Catena precedente: {legacy * 1000:.1f} ms")
+    print(f"text_cleaner:      {new * 1000:.1f} ms")
+    print(f"Speedup:           {legacy / new:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Corpus di pagine di notizie per i benchmark degli scraper.
+
+Se viene indicata una cartella, usa le pagine salvate (*.html) al suo interno; il
+nome del file, se contiene un dominio (es. 'ansa.it_123.html'), viene usato per
+scegliere i selettori. Altrimenti genera pagine sintetiche con la struttura tipica
+di un sito di notizie: menu, banner, script, articolo, correlati e commenti.
+"""
+from pathlib import Path
+
+DOMAINS = ["ansa.it", "repubblica.it", "corriere.it", "ilsole24ore.com", "bbc.com", "example.org"]
+
+PARAGRAPH = (
+    "Il Consiglio dei ministri ha approvato nella serata di ieri il nuovo pacchetto di misure "
+    "su fisco, lavoro e pensioni, che ora passa all'esame del Parlamento per la conversione. "
+)
+
+def _synthetic_page(i, paragraphs=40, related=30):
+    domain = DOMAINS[i % len(DOMAINS)]
+    nav = "".join(f'<li class="menu-item"><a href="/sezione/{j}">Sezione {j}</a></li>' for j in range(40))
+    scripts = "".join(f'<script>window.dataLayer = window.dataLayer || []; dataLayer.push({{"id": {j}}});</script>' for j in range(15))
+    body = "".join(
+        f'<p>{PARAGRAPH * 2}<a href="/link/{j}">approfondimento {j}</a> <strong>dato {j}</strong>.</p>'
+        + (f'<div class="advertisement"><iframe src="/ads/{j}"></iframe><span>Pubblicità</span></div>' if j % 5 == 0 else '')
+        + (f'<div class="social-share"><a>Facebook</a><a>X</a><a>WhatsApp</a></div>' if j % 10 == 0 else '')
+        for j in range(paragraphs)
+    )
+    related_items = "".join(
+        f'<div class="card"><a href="/notizia/{j}"><img src="/img/{j}.jpg"><h3>Notizia correlata numero {j}</h3></a></div>'
+        for j in range(related)
+    )
+    comments = "".join(f'<div class="comment"><p>Commento {j} di un lettore.</p></div>' for j in range(20))
+    html = f"""<!DOCTYPE html>
+<html lang="it"><head><meta charset="utf-8"><title>Manovra {i}: cosa cambia per famiglie e imprese - {domain}</title>
+<meta property="og:title" content="Manovra {i}: cosa cambia"><style>body {{ font-family: sans-serif; }}</style>{scripts}</head>
+<body><header class="header"><div class="top-bar">Abbonati</div><nav class="navigation"><ul class="menu">{nav}</ul></nav></header>
+<div class="breadcrumb"><a href="/">Home</a> &gt; <a href="/politica">Politica</a></div>
+<main><article class="article"><h1 class="article-title">Manovra {i}: cosa cambia per famiglie e imprese</h1>
+<div class="byline">di Mario Rossi</div><time datetime="2024-01-15T10:30:00+01:00">15 gennaio 2024</time>
+<div class="article-body">{body}<div class="tags"><a>politica</a><a>economia</a></div></div>
+<aside class="related-articles">{related_items}</aside></article></main>
+<aside class="sidebar"><div class="trending">{related_items}</div><div class="newsletter"><form><input></form></div></aside>
+<section class="comments">{comments}</section>
+<footer class="footer"><div class="bottom-bar">Copyright</div></footer></body></html>"""
+    return f"https://www.{domain}/notizie/{i}.html", html.encode("utf-8")
+
+def load_pages(directory=None, count=30):
+    """Restituisce una lista di (url, html in bytes)"""
+    if directory:
+        pages = []
+        for path in sorted(Path(directory).glob("*.html")):
+            domain = path.stem.split("_", 1)[0] if "." in path.stem.split("_", 1)[0] else "example.org"
+            pages.append((f"https://{domain}/{path.name}", path.read_bytes()))
+        if pages:
+            return pages
+    return [_synthetic_page(i) for i in range(count)]
+
+# Paragrafi del corpo usati nelle pagine di prova, da confrontare con il testo estratto
+BODY_SENTENCES = [
+    "La Corte dei conti ha pubblicato la relazione annuale sulla spesa pubblica, con un capitolo dedicato agli investimenti del piano nazionale di ripresa.",
+    "Secondo i magistrati contabili, il ritmo di attuazione dei progetti resta disomogeneo tra le regioni, con ritardi più marcati nei comuni di piccole dimensioni.",
+    "Il documento segnala inoltre che una parte dei fondi destinati alla sanità territoriale non è ancora stata assegnata, mentre le scadenze europee si avvicinano.",
+    "Il ministero ha replicato che i dati si riferiscono al primo semestre e che nei mesi successivi sono stati sbloccati oltre due miliardi di euro.",
+    "Le associazioni dei consumatori chiedono maggiore trasparenza, a partire dalla pubblicazione dei cronoprogrammi aggiornati per ogni singolo intervento.",
+    "Nel frattempo, le opposizioni hanno annunciato un'interrogazione parlamentare per conoscere lo stato dei cantieri già avviati e di quelli ancora fermi.",
+]
+
+def _links(prefix, n, cls="item"):
+    return "".join(f'<li class="{cls}"><a href="/{prefix}/{j}">Titolo {prefix} numero {j}</a></li>' for j in range(n))
+
+def _fixture(layout, i):
+    body = [f"{sentence} Aggiornamento {i}." for sentence in BODY_SENTENCES]
+    paragraphs = "".join(f"<p>{text}</p>" for text in body)
+    teasers = "".join(
+        f'<article class="teaser"><a href="/t/{j}"><h3>Altra notizia in evidenza {j}</h3></a><p>Breve sommario della notizia {j}.</p></article>'
+        for j in range(6)
+    )
+    comments = "".join(f'<div class="disqus-post"><p>Commento numero {j}, non sono d\'accordo con quanto scritto.</p></div>' for j in range(8))
+    if layout == "tema_wordpress":
+        main = f'<div class="td-post-text">{paragraphs}</div><div class="jp-relatedposts"><ul>{_links("rel", 8)}</ul></div>'
+    elif layout == "testo_in_div":
+        main = '<div class="corpo">' + "<br><br>".join(body) + '</div>'
+    elif layout == "teaser_prima":
+        main = f'<section class="top">{teasers}</section><div class="story-wrap"><div class="x1">{paragraphs}</div></div>'
+    elif layout == "wrapper_content":
+        main = f'<div class="box-links"><ul>{_links("menu", 25)}</ul></div><div class="txt">{paragraphs}</div>'
+        main = f'<div class="content">{main}<div class="lista-brevi"><ul>{_links("brevi", 20)}</ul></div></div>'
+    else:
+        main = f'<article><div class="article-body">{paragraphs}</div><div class="tags"><a>tag</a></div></article>'
+    html = f"""<!DOCTYPE html><html><head><title>Relazione della Corte dei conti {i}</title></head>
+<body><div class="top-menu"><ul>{_links("sezione", 30)}</ul></div>
+<h1>Relazione della Corte dei conti {i}</h1>{main}
+<div class="commenti-utenti">{comments}</div><div class="footer-links">{_links("footer", 15)}</div></body></html>"""
+    return f"https://www.sito{i % 7}.example/{layout}/{i}.html", html.encode("utf-8"), " ".join(body)
+
+FIXTURE_LAYOUTS = ["standard", "tema_wordpress", "testo_in_div", "teaser_prima", "wrapper_content"]
+
+def fixture_pages(count=50):
+    """Pagine con layout diversi e il testo atteso del corpo: restituisce (url, html, testo)"""
+    return [_fixture(FIXTURE_LAYOUTS[i % len(FIXTURE_LAYOUTS)], i) for i in range(count)]
+
+STUDY_SENTENCE = (
+    "Ancient DNA was extracted from the petrous bone of each individual and sequenced to a mean "
+    "coverage of 1.2x, following the protocol described in the supplementary information. "
+)
+STUDY_SECTIONS = ["Introduction", "Materials and Methods", "Results", "Discussion", "Conclusions", "References"]
+
+def synthetic_study_page(paragraphs=20):
+    """Pagina di uno studio su rivista: menu, metadati, sezioni con titoli e bibliografia"""
+    nav = "".join(f'<li><a href="/journal/{j}">Issue {j}</a></li>' for j in range(40))
+    sections = "".join(
+        f'<section><h2>{k + 1}. {name}</h2>'
+        + "".join(f'<p>{STUDY_SENTENCE * 3}<a href="#ref{j}">[{j}]</a></p>' for j in range(paragraphs))
+        + '</section>'
+        for k, name in enumerate(STUDY_SECTIONS)
+    )
+    html = f"""<!DOCTYPE html>
+<html><head><title>Ancient genomes from Pompeii</title><script>var config = {{"issue": 12}};</script></head>
+<body><header><nav><ul>{nav}</ul></nav></header>
+<main><h1 class="article-title">Ancient genomes from Pompeii</h1>
+<div class="authors"><span class="author">E. Pilli</span><span class="author">D. Reich</span></div>
+<div class="journal-name">Current Biology</div><time>7 November 2024</time>
+<div class="abstract"><p>{STUDY_SENTENCE}</p></div>{sections}</main>
+<footer>This article is peer-reviewed. https://doi.org/10.1016/j.cub.2024.10.007</footer></body></html>"""
+    return "https://www.cell.com/current-biology/fulltext/S0960-9822(24)01349-0", html.encode("utf-8")
@@ -1,8 +1,9 @@
 
-import requests
 import json
 from abc import ABC, abstractmethod
 
+from .http_client import get_http_client
+
 class AIProvider(ABC):
     @abstractmethod
     def generate(self, prompt: str, max_tokens: int = 2048) -> str:
@@ -21,7 +22,7 @@ class OllamaProvider(AIProvider):
             "options": {"num_predict": max_tokens}
         }
         try:
-            response = requests.post(self.url, json=payload, timeout=120)
+            response = get_http_client().post(self.url, json=payload, timeout=(5, 120))
             response.raise_for_status()
             data = response.json()
             return data.get("response", "[Nessuna risposta da Ollama]")
@@ -45,7 +46,7 @@ class OpenAIProvider(AIProvider):
             "max_tokens": max_tokens
         }
         try:
-            response = requests.post(self.url, json=payload, headers=headers, timeout=60)
+            response = get_http_client().post(self.url, json=payload, headers=headers, timeout=(5, 60))
             response.raise_for_status()
             data = response.json()
             return data["choices"][0]["message"]["content"]
@@ -70,7 +71,7 @@ class ClaudeProvider(AIProvider):
             "messages": [{"role": "user", "content": prompt}]
         }
         try:
-            response = requests.post(self.url, json=payload, headers=headers, timeout=60)
+            response = get_http_client().post(self.url, json=payload, headers=headers, timeout=(5, 60))
             response.raise_for_status()
             data = response.json()
             return data["content"][0]["text"]
@@ -1,18 +1,50 @@
 
 import requests
 from bs4 import BeautifulSoup
-import re
 import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from urllib.parse import urlparse
 from typing import Dict, Optional, List
-import random
+
+from .content_cache import get_content_cache
+from .content_extractor import (
+    BLOCK_TAGS, UNWANTED_SELECTORS, extract_main_content, get_content_budget, pruned_text, truncate_text
+)
+from .html_parser import parse_html
+from .http_client import get_http_client
+from .metadata import extract_metadata
+from .models import Article
+from .rate_limiter import HostLimiter, get_rate_limiter
+from .selector_memory import get_selector_memory
+from .text_cleaner import clean_control_text
+
+class ScrapeError(Exception):
+    """La pagina è stata scaricata ma non contiene un articolo utilizzabile"""
+
+def _timed(function, *args):
+    """Esegue function e restituisce (risultato, secondi impiegati)"""
+    started = time.perf_counter()
+    return function(*args), time.perf_counter() - started
+
+def _failure_reason(error):
+    """Descrizione breve del motivo per cui uno scraping è fallito"""
+    if isinstance(error, ScrapeError):
+        return str(error)
+    if isinstance(error, requests.Timeout):
+        return "Timeout di rete"
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return f"HTTP {error.response.status_code}"
+    if isinstance(error, requests.ConnectionError):
+        return "Connessione fallita"
+    return f"{error.__class__.__name__}: {error}"
 
 class ArticleScraper:
     """Scraper intelligente per estrarre contenuto da articoli web"""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Connessioni condivise con il resto dell'applicazione, header propri dello scraper
+        self.http = get_http_client()
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'it-IT,it;q=0.9,en;q=0.8',
@@ -20,7 +52,7 @@ class ArticleScraper:
             'DNT': '1',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
-        })
+        }
         
         self.content_selectors = {
             'ansa.it': [
@@ -106,6 +138,8 @@ class ArticleScraper:
             ]
         }
         
+        self._selectors_by_domain = {}
+        
         self.title_selectors = [
             'h1',
             '.article-title',
@@ -145,28 +179,22 @@ class ArticleScraper:
     
     def get_content_selectors(self, domain: str) -> List[str]:
         """Ottiene i selettori CSS appropriati per il dominio"""
-        for site_domain, selectors in self.content_selectors.items():
-            if site_domain in domain:
-                return selectors
-        return self.content_selectors['default']
+        selectors = self._selectors_by_domain.get(domain)
+        if selectors is None:
+            # Cerca il dominio e poi i suoi suffissi: 'edition.bbc.com' -> 'bbc.com'
+            selectors = self.content_selectors['default']
+            parts = domain.split('.')
+            for i in range(len(parts) - 1):
+                candidate = self.content_selectors.get('.'.join(parts[i:]))
+                if candidate is not None:
+                    selectors = candidate
+                    break
+            self._selectors_by_domain[domain] = selectors
+        return selectors
     
     def clean_text(self, text: str) -> str:
         """Pulisce il testo estratto"""
-        if not text:
-            return ""
-        
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        text = ansi_escape.sub('', text)
-        
-        text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', text)
-        
-        text = re.sub(r'\s+', ' ', text)
-        
-        text = re.sub(r'\n\s*\n', '\n\n', text)
-        
-        text = text.strip()
-        
-        return text
+        return clean_control_text(text)
     
     def extract_title(self, soup: BeautifulSoup) -> str:
         """Estrae il titolo dell'articolo"""
@@ -210,37 +238,98 @@ class ArticleScraper:
         return "Autore non disponibile"
     
     def extract_content(self, soup: BeautifulSoup, domain: str) -> str:
-        """Estrae il contenuto principale dell'articolo"""
-        content_selectors = self.get_content_selectors(domain)
+        """Estrae il contenuto principale dell'articolo.
+        
+        Prova per primo il percorso che ha funzionato l'ultima volta per il dominio;
+        altrimenti i selettori dedicati al sito, l'estrattore per densità di testo, i
+        selettori generici e infine i paragrafi. Il percorso vincente viene memorizzato.
+        """
+        memory = get_selector_memory()
+        learned = memory.get(domain)
+        if learned:
+            content = self._extract_with_path(soup, learned)
+            if content:
+                memory.record(domain, learned)
+                return content
+        
+        for path, content in self._extraction_attempts(soup, domain, skip=learned):
+            if content:
+                # Il ripiego sui paragrafi può restituire poco testo: non è un percorso da ricordare
+                if len(content) > 100:
+                    memory.record(domain, path)
+                return content
+        
+        if learned:
+            memory.forget(domain)
+        return "Contenuto non disponibile"
+    
+    def _extraction_attempts(self, soup: BeautifulSoup, domain: str, skip=None):
+        """Genera (percorso, contenuto) nell'ordine di prova, calcolando ogni tentativo solo se serve"""
+        domain_selectors = self.get_content_selectors(domain)
+        default_selectors = self.content_selectors['default']
+        
+        walked = set()
+        if domain_selectors is not default_selectors:
+            for path, content in self._selector_attempts(soup, domain_selectors, walked, skip):
+                yield path, content
+        
+        if skip != {'method': 'density'}:
+            yield {'method': 'density'}, extract_main_content(soup, budget=get_content_budget())
         
+        for path, content in self._selector_attempts(soup, default_selectors, walked, skip):
+            yield path, content
+        
+        if skip != {'method': 'paragraphs'}:
+            yield {'method': 'paragraphs'}, self._paragraph_content(soup)
+    
+    def _selector_attempts(self, soup: BeautifulSoup, content_selectors: List[str], walked, skip=None):
         for selector in content_selectors:
+            path = {'method': 'selector', 'selector': selector}
+            if path == skip:
+                continue
             content_elem = soup.select_one(selector)
-            if content_elem:
-                unwanted_selectors = [
-                    'script', 'style', 'nav', 'header', 'footer', 
-                    '.advertisement', '.ads', '.social-share', '.related-articles',
-                    '.sidebar', '.comments', '.recommendations', '.newsletter',
-                    '.breadcrumb', '.navigation', '.menu', '.footer',
-                    '.header', '.top-bar', '.bottom-bar', '.social-media',
-                    '.share-buttons', '.tags', '.categories', '.author-bio',
-                    '.related-content', '.more-articles', '.trending',
-                    '.popular', '.latest', '.breaking', '.featured'
-                ]
-                
-                for unwanted_selector in unwanted_selectors:
-                    for unwanted in content_elem.select(unwanted_selector):
-                        unwanted.decompose()
-                
-                content = content_elem.get_text()
-                content = self.clean_text(content)
-                
-                if content and len(content) > 100:  # Contenuto deve essere significativo
-                    return content
-        
+            if content_elem and id(content_elem) not in walked:
+                # Selettori diversi possono indicare lo stesso elemento: lo si visita una volta sola
+                walked.add(id(content_elem))
+                yield path, self._element_content(content_elem)
+    
+    def _element_content(self, content_elem) -> Optional[str]:
+        # La visita si ferma al budget di caratteri: il resto della pagina non finirebbe nei prompt
+        budget = get_content_budget()
+        content = truncate_text(self.clean_text(pruned_text(content_elem, block_tags=BLOCK_TAGS, budget=budget)), budget)
+        if content and len(content) > 100:  # Contenuto deve essere significativo
+            return content
+        return None
+    
+    def _extract_with_path(self, soup: BeautifulSoup, path) -> Optional[str]:
+        """Applica un percorso di estrazione memorizzato"""
+        method = path.get('method')
+        if method == 'selector':
+            content_elem = soup.select_one(path.get('selector', ''))
+            return self._element_content(content_elem) if content_elem else None
+        if method == 'density':
+            return extract_main_content(soup, budget=get_content_budget())
+        if method == 'paragraphs':
+            return self._paragraph_content(soup)
+        return None
+    
+    def extract_content_with_selectors(self, soup: BeautifulSoup, domain: str) -> str:
+        """Estrazione basata solo sui selettori CSS, con ripiego sui paragrafi della pagina"""
+        for _, content in self._selector_attempts(soup, self.get_content_selectors(domain), set()):
+            if content:
+                return content
+        return self._paragraph_content(soup) or "Contenuto non disponibile"
+    
+    def _paragraph_content(self, soup: BeautifulSoup) -> Optional[str]:
+        """Ripiego: unisce i paragrafi della pagina che non sembrano navigazione"""
         paragraphs = soup.find_all('p')
         if paragraphs:
+            budget = get_content_budget()
             content_parts = []
+            length = 0
             for p in paragraphs:
+                if length >= budget:
+                    break
                 parent = p.parent
                 is_main_content = False
                 
@@ -254,56 +343,89 @@ class ArticleScraper:
                 if (text and len(text) > 30 and 
                     not any(nav_word in text.lower() for nav_word in ['home', 'menu', 'search', 'login', 'register', 'cookie', 'privacy'])):
                     content_parts.append(text)
+                    length += len(text) + 2
             
             if content_parts:
-                return '\n\n'.join(content_parts)
+                return truncate_text('\n\n'.join(content_parts), budget)
         
-        return "Contenuto non disponibile"
+        return None
     
-    def scrape_article(self, url: str) -> Optional[Dict]:
-        """Scarica e analizza un articolo da un URL"""
+    def download(self, url: str, timeout=15) -> bytes:
+        """Scarica la pagina HTML di un articolo rispettando il limite per dominio"""
+        get_rate_limiter().acquire(url)
+        
+        # Gli header arrivano prima del corpo: una pagina non HTML non viene scaricata
+        response = self.http.get(url, headers=self.headers, timeout=timeout, stream=True)
         try:
-            print(f"🔍 Scraping: {url}")
-            
-            time.sleep(random.uniform(1, 3))
-            
-            response = self.session.get(url, timeout=15)
             response.raise_for_status()
             
             if 'text/html' not in response.headers.get('content-type', ''):
-                print("❌ La pagina non è HTML")
-                return None
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            domain = self.extract_domain(url)
-            
-            title = self.extract_title(soup)
-            content = self.extract_content(soup, domain)
-            date = self.extract_date(soup)
-            author = self.extract_author(soup)
-            
-            if not content or content == "Contenuto non disponibile" or len(content) < 100:
-                print("❌ Contenuto insufficiente o non trovato")
-                return None
+                raise ScrapeError("La pagina non è HTML")
+            html, _ = self.http.read_body(response)
+        finally:
+            response.close()
+        return html
+    
+    def parse_article(self, url: str, html: bytes) -> Article:
+        """Estrae titolo, contenuto, data e autore da una pagina già scaricata"""
+        soup = parse_html(html)
+        domain = self.extract_domain(url)
+        
+        # I metadati dell'<head> evitano le ricerche con i selettori sull'intero documento
+        metadata = extract_metadata(soup)
+        title = metadata.get('title') or self.extract_title(soup)
+        content = self.extract_content(soup, domain)
+        date = metadata.get('date') or self.extract_date(soup)
+        author = ', '.join(metadata.get('authors', [])) or self.extract_author(soup)
+        
+        if not content or content == "Contenuto non disponibile" or len(content) < 100:
+            raise ScrapeError("Contenuto insufficiente o non trovato")
+        
+        return Article.from_dict({
+            'title': title,
+            'content': content,
+            'summary': content[:500] + "..." if len(content) > 500 else content,
+            'date': date,
+            'author': author,
+            'source': domain,
+            'link': url,
+            'scraped': True
+        })
+    
+    def get_cached_article(self, url: str) -> Optional[Article]:
+        """Restituisce l'articolo già estratto in precedenza per url, se ancora in cache"""
+        cache = get_content_cache()
+        data = cache.get('article', url) if cache else None
+        return Article.from_dict(data) if data else None
+    
+    def _parse_and_cache(self, url: str, html: bytes) -> Article:
+        article = self.parse_article(url, html)
+        cache = get_content_cache()
+        if cache:
+            cache.put('article', url, article.to_dict())
+        return article
+    
+    def scrape_article(self, url: str) -> Optional[Article]:
+        """Scarica e analizza un articolo da un URL"""
+        try:
+            print(f"🔍 Scraping: {url}")
             
-            article = {
-                'title': title,
-                'content': content,
-                'summary': content[:500] + "..." if len(content) > 500 else content,
-                'date': date,
-                'author': author,
-                'source': domain,
-                'link': url,
-                'scraped': True
-            }
+            article = self.get_cached_article(url)
+            if article:
+                print("⚡ Articolo già estratto di recente, uso la cache")
+            else:
+                article = self._parse_and_cache(url, self.download(url))
             
-            print(f"✅ Articolo estratto: {len(content)} caratteri")
-            print(f"📰 Titolo: {title}")
-            print(f"📅 Data: {date}")
-            print(f"✍️ Autore: {author}")
-            print(f"🌐 Fonte: {domain}")
+            print(f"✅ Articolo estratto: {len(article.content)} caratteri")
+            print(f"📰 Titolo: {article.title}")
+            print(f"📅 Data: {article.date}")
+            print(f"✍️ Autore: {article.author}")
+            print(f"🌐 Fonte: {article.source}")
             return article
             
+        except ScrapeError as e:
+            print(f"❌ {e}")
+            return None
         except requests.RequestException as e:
             print(f"❌ Errore di rete: {e}")
             return None
@@ -311,6 +433,80 @@ class ArticleScraper:
             print(f"❌ Errore durante lo scraping: {e}")
             return None
     
+    def scrape_many(self, urls, max_workers=8, deadline=30, per_host_limit=2, parse_workers=2):
+        """Scarica e analizza più articoli in parallelo, restituendo i risultati man mano che arrivano.
+        
+        I download girano su un pool di thread con al massimo per_host_limit richieste
+        simultanee per host; il parsing avviene su un pool separato, così una pagina
+        pesante da analizzare non blocca i download. Ogni risultato è un dizionario con
+        'url', 'article' (None se fallito), 'error', 'download_time', 'parse_time',
+        'elapsed' (secondi dall'inizio del lotto) e 'cached'. Gli articoli già in cache
+        vengono restituiti subito; allo scadere di deadline gli URL rimasti vengono
+        restituiti come falliti per tempo scaduto.
+        """
+        urls = list(dict.fromkeys(url for url in urls if url))
+        if not urls:
+            return
+        
+        started = time.monotonic()
+        cached = {}
+        for url in urls:
+            article = self.get_cached_article(url)
+            if article:
+                cached[url] = article
+        urls = [url for url in urls if url not in cached]
+        for url, article in cached.items():
+            yield {'url': url, 'article': article, 'error': None, 'download_time': 0.0,
+                   'parse_time': 0.0, 'elapsed': time.monotonic() - started, 'cached': True}
+        if not urls:
+            return
+        
+        host_limiter = HostLimiter(per_host_limit)
+        download_pool = ThreadPoolExecutor(max_workers=min(max_workers, len(urls)))
+        parse_pool = ThreadPoolExecutor(max_workers=parse_workers)
+        pending = {
+            download_pool.submit(host_limiter.run, url, _timed, self.download, url): ('download', url)
+            for url in urls
+        }
+        download_times = {}
+        
+        def result(url, article=None, error=None, parse_time=None):
+            return {
+                'url': url,
+                'article': article,
+                'error': error,
+                'download_time': download_times.get(url),
+                'parse_time': parse_time,
+                'elapsed': time.monotonic() - started,
+                'cached': False
+            }
+        
+        try:
+            while pending:
+                remaining = deadline - (time.monotonic() - started)
+                if remaining <= 0:
+                    break
+                done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, url = pending.pop(future)
+                    try:
+                        value, seconds = future.result()
+                    except Exception as e:
+                        yield result(url, error=_failure_reason(e))
+                        continue
+                    
+                    if stage == 'download':
+                        download_times[url] = seconds
+                        pending[parse_pool.submit(_timed, self._parse_and_cache, url, value)] = ('parse', url)
+                    else:
+                        yield result(url, article=value, parse_time=seconds)
+            
+            for stage, url in pending.values():
+                yield result(url, error="Tempo scaduto durante il download" if stage == 'download' else "Tempo scaduto durante l'analisi")
+        finally:
+            download_pool.shutdown(wait=False, cancel_futures=True)
+            parse_pool.shutdown(wait=False, cancel_futures=True)
+    
     def validate_url(self, url: str) -> bool:
         """Valida se l'URL sembra essere un articolo di notizia"""
         if not url or not url.startswith(('http://', 'https://')):
@@ -338,7 +534,7 @@ class ArticleScraper:
     def get_article_info(self, url: str) -> Optional[Dict]:
         """Ottiene informazioni rapide sull'articolo senza scaricare tutto"""
         try:
-            response = self.session.head(url, timeout=10)
+            response = self.http.head(url, headers=self.headers, timeout=10)
             response.raise_for_status()
             
             return {
@@ -0,0 +1,267 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+from .dedup import canonicalize_url
+from .models import Article
+from .settings import get_data_dir
+
+# Il contenuto non è tra le colonne lette in blocco: viene caricato solo su richiesta
+ARTICLE_COLUMNS = ['link_hash', 'link', 'title', 'summary', 'author', 'source', 'date', 'parsed_date', 'sources', 'source_count']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    link_hash TEXT PRIMARY KEY,
+    link TEXT NOT NULL,
+    title TEXT,
+    summary TEXT,
+    author TEXT,
+    source TEXT,
+    date TEXT,
+    parsed_date TEXT,
+    sources TEXT,
+    source_count INTEGER DEFAULT 1,
+    content TEXT,
+    fetched_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_source ON articles(source);
+CREATE INDEX IF NOT EXISTS idx_articles_parsed_date ON articles(parsed_date DESC, fetched_at DESC);
+"""
+
+def link_hash(link):
+    """Hash stabile del link canonico, usato come chiave primaria"""
+    return hashlib.sha1(canonicalize_url(link).encode('utf-8')).hexdigest()
+
+def _merge_sources(stored, article):
+    """Fonti archiviate seguite da quelle nuove dell'articolo, senza duplicati"""
+    sources = list(stored)
+    incoming = article.get('sources') or ([article['source']] if article.get('source') else [])
+    for source in incoming:
+        if source and source not in sources:
+            sources.append(source)
+    return sources
+
+class ArticleStore:
+    """Archivio persistente degli articoli su SQLite (modalità WAL)"""
+    
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._version = 0
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self._lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+    
+    @property
+    def version(self):
+        """Contatore incrementato a ogni scrittura, per invalidare le viste in cache"""
+        return self._version
+    
+    def _stored_sources(self, hashes):
+        """Fonti già archiviate per gli hash indicati (da chiamare con il lock acquisito)"""
+        stored = {}
+        hashes = list(set(hashes))
+        for start in range(0, len(hashes), 500):
+            chunk = hashes[start:start + 500]
+            query = f"SELECT link_hash, sources FROM articles WHERE link_hash IN ({', '.join('?' * len(chunk))})"
+            for hash_value, sources in self.conn.execute(query, chunk):
+                try:
+                    stored[hash_value] = json.loads(sources or '[]')
+                except ValueError:
+                    stored[hash_value] = []
+        return stored
+    
+    def upsert_many(self, articles):
+        """Inserisce o aggiorna in blocco gli articoli, chiave = hash del link.
+        
+        Le fonti di un articolo già archiviato vengono unite a quelle nuove e
+        source_count è sempre ricavato dalla lista unita.
+        """
+        now = time.time()
+        articles = [(link_hash(article.get('link', '')), article) for article in articles if article.get('link')]
+        if not articles:
+            return 0
+        
+        with self._lock:
+            stored = self._stored_sources([hash_value for hash_value, _ in articles])
+            rows = []
+            for hash_value, article in articles:
+                sources = _merge_sources(stored.get(hash_value, []), article)
+                stored[hash_value] = sources
+                rows.append((
+                    hash_value,
+                    article.get('link', ''),
+                    article.get('title', ''),
+                    article.get('summary', ''),
+                    article.get('author', ''),
+                    article.get('source', ''),
+                    article.get('date', ''),
+                    article.get('parsed_date', ''),
+                    json.dumps(sources, ensure_ascii=False),
+                    max(len(sources), 1),
+                    article.get('content'),
+                    now
+                ))
+            
+            with self.conn:
+                self.conn.executemany("""
+                    INSERT INTO articles (link_hash, link, title, summary, author, source, date,
+                                          parsed_date, sources, source_count, content, fetched_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(link_hash) DO UPDATE SET
+                        title = excluded.title,
+                        summary = excluded.summary,
+                        author = excluded.author,
+                        date = excluded.date,
+                        parsed_date = excluded.parsed_date,
+                        sources = excluded.sources,
+                        source_count = excluded.source_count,
+                        content = COALESCE(excluded.content, articles.content)
+                """, rows)
+            self._version += 1
+        return len(rows)
+    
+    def update_sources(self, updates):
+        """Aggiunge fonti alle storie già archiviate ({'link', 'sources'}), unendole a quelle salvate"""
+        updates = [(link_hash(update['link']), update) for update in updates if update.get('link')]
+        if not updates:
+            return 0
+        
+        with self._lock:
+            stored = self._stored_sources([hash_value for hash_value, _ in updates])
+            rows = []
+            for hash_value, update in updates:
+                if hash_value not in stored:
+                    continue
+                sources = _merge_sources(stored[hash_value], update)
+                stored[hash_value] = sources
+                rows.append((json.dumps(sources, ensure_ascii=False), max(len(sources), 1), hash_value))
+            with self.conn:
+                self.conn.executemany("UPDATE articles SET sources = ?, source_count = ? WHERE link_hash = ?", rows)
+            self._version += 1
+        return len(rows)
+    
+    def count(self, source=None):
+        """Numero di articoli archiviati, eventualmente per una sola fonte"""
+        with self._lock:
+            if source:
+                row = self.conn.execute("SELECT COUNT(*) FROM articles WHERE source = ?", (source,)).fetchone()
+            else:
+                row = self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()
+        return row[0]
+    
+    def get_page(self, offset=0, limit=15, source=None):
+        """Restituisce una pagina di articoli ordinati dal più recente"""
+        query = f"SELECT {', '.join(ARTICLE_COLUMNS)} FROM articles"
+        params = []
+        if source:
+            query += " WHERE source = ?"
+            params.append(source)
+        query += " ORDER BY parsed_date DESC, fetched_at DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+        
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [self._row_to_article(row) for row in rows]
+    
+    def get_by_link(self, link):
+        """Cerca un articolo tramite il suo link"""
+        with self._lock:
+            row = self.conn.execute(
+                f"SELECT {', '.join(ARTICLE_COLUMNS)} FROM articles WHERE link_hash = ?", (link_hash(link),)
+            ).fetchone()
+        return self._row_to_article(row) if row else None
+    
+    def articles(self, source=None, page_size=100):
+        """Vista a sola lettura e paginata sull'archivio, utilizzabile come una lista"""
+        return StoredArticles(self, source, page_size)
+    
+    def close(self):
+        with self._lock:
+            self.conn.close()
+    
+    def get_content(self, hash_value):
+        """Legge il corpo di un articolo archiviato"""
+        with self._lock:
+            row = self.conn.execute("SELECT content FROM articles WHERE link_hash = ?", (hash_value,)).fetchone()
+        return row[0] if row else None
+    
+    def _row_to_article(self, row):
+        values = dict(row)
+        hash_value = values.pop('link_hash')
+        try:
+            values['sources'] = json.loads(values.get('sources') or '[]')
+        except ValueError:
+            values['sources'] = []
+        return Article.from_dict(values, content_loader=lambda: self.get_content(hash_value))
+
+class StoredArticles(Sequence):
+    """Sequenza che legge gli articoli dall'archivio a blocchi, senza caricarli tutti in memoria"""
+    
+    def __init__(self, store, source=None, page_size=100):
+        self.store = store
+        self.source = source
+        self.page_size = page_size
+        self._version = None
+        self._length = 0
+        self._blocks = {}
+    
+    def _refresh(self):
+        if self._version != self.store.version:
+            self._version = self.store.version
+            self._length = self.store.count(self.source)
+            self._blocks = {}
+    
+    def __len__(self):
+        self._refresh()
+        return self._length
+    
+    def __getitem__(self, index):
+        self._refresh()
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            if stop <= start:
+                return []
+            return self.store.get_page(start, stop - start, self.source)
+        
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("indice articolo fuori intervallo")
+        
+        block_number = index // self.page_size
+        block = self._blocks.get(block_number)
+        if block is None:
+            # Tiene in memoria solo pochi blocchi alla volta
+            if len(self._blocks) >= 8:
+                self._blocks.clear()
+            block = self.store.get_page(block_number * self.page_size, self.page_size, self.source)
+            self._blocks[block_number] = block
+        return block[index - block_number * self.page_size]
+
+def _is_enabled(value):
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+def get_article_store(settings):
+    """Apre l'archivio configurato in [Analytics], o None se il tracciamento è disattivato"""
+    if not _is_enabled(settings.get('enable_tracking', 'true')):
+        return None
+    
+    db_path = Path(settings.get('db_path') or 'news_analytics.db').expanduser()
+    if not db_path.is_absolute():
+        db_path = get_data_dir() / db_path
+    
+    try:
+        return ArticleStore(db_path)
+    except sqlite3.Error as e:
+        print(f"⚠️ Archivio articoli non disponibile: {e}")
+        return None
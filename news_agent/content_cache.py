@@ -0,0 +1,140 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from .dedup import canonicalize_url
+from .settings import get_data_dir
+
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scraped (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    url TEXT NOT NULL,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scraped_accessed ON scraped(accessed_at);
+"""
+
+class ContentCache:
+    """Cache su disco dei contenuti estratti dalle pagine, indicizzata per URL canonico.
+    
+    I valori (dizionari già estratti: titolo, testo, data, autore...) sono salvati
+    come JSON compresso con zlib. Le voci scadono dopo ttl secondi e, superata la
+    dimensione massima, vengono eliminate quelle usate meno di recente (LRU).
+    """
+    
+    def __init__(self, path=None, ttl=DEFAULT_TTL, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = Path(path) if path else get_data_dir() / "content_cache.db"
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+            self._total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM scraped").fetchone()[0]
+    
+    @staticmethod
+    def _key(kind, url):
+        return hashlib.sha1(f"{kind}:{canonicalize_url(url)}".encode('utf-8')).hexdigest()
+    
+    def get(self, kind, url):
+        """Restituisce il contenuto in cache per url, o None se assente o scaduto"""
+        key = self._key(kind, url)
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute("SELECT data, size, created_at FROM scraped WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            data, size, created_at = row
+            with self.conn:
+                if now - created_at > self.ttl:
+                    self.conn.execute("DELETE FROM scraped WHERE key = ?", (key,))
+                    self._total_bytes -= size
+                    self.misses += 1
+                    return None
+                self.conn.execute("UPDATE scraped SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        
+        try:
+            return json.loads(zlib.decompress(data).decode('utf-8'))
+        except (zlib.error, ValueError):
+            return None
+    
+    def put(self, kind, url, value):
+        """Salva un contenuto estratto e applica il limite di dimensione"""
+        data = zlib.compress(json.dumps(value, ensure_ascii=False).encode('utf-8'), 6)
+        key = self._key(kind, url)
+        now = time.time()
+        with self._lock:
+            with self.conn:
+                row = self.conn.execute("SELECT size FROM scraped WHERE key = ?", (key,)).fetchone()
+                self.conn.execute("""
+                    INSERT OR REPLACE INTO scraped (key, kind, url, data, size, created_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (key, kind, url, data, len(data), now, now))
+                self._total_bytes += len(data) - (row[0] if row else 0)
+                if self._total_bytes > self.max_bytes:
+                    self._evict()
+    
+    def _evict(self):
+        """Elimina le voci usate meno di recente fino a scendere al 90% del limite"""
+        target = self.max_bytes * 0.9
+        rows = self.conn.execute("SELECT key, size FROM scraped ORDER BY accessed_at").fetchall()
+        expired_keys = []
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            expired_keys.append((key,))
+            self._total_bytes -= size
+        self.conn.executemany("DELETE FROM scraped WHERE key = ?", expired_keys)
+    
+    def stats(self):
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM scraped").fetchone()[0]
+            return {'entries': entries, 'bytes': self._total_bytes, 'hits': self.hits, 'misses': self.misses}
+    
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+_content_cache = None
+_content_cache_lock = threading.Lock()
+
+def get_content_cache():
+    """Restituisce la cache dei contenuti condivisa dal processo (None se il disco non è disponibile)"""
+    global _content_cache
+    with _content_cache_lock:
+        if _content_cache is None:
+            try:
+                _content_cache = ContentCache()
+            except sqlite3.Error as e:
+                print(f"⚠️ Cache dei contenuti non disponibile: {e}")
+                _content_cache = False
+        return _content_cache or None
+
+def configure_content_cache(settings):
+    """Applica TTL e dimensione massima della sezione [Network] alla cache condivisa"""
+    cache = get_content_cache()
+    if cache is None:
+        return None
+    try:
+        cache.ttl = float(settings.get('scrape_cache_ttl', DEFAULT_TTL))
+        cache.max_bytes = int(float(settings.get('scrape_cache_max_mb', DEFAULT_MAX_BYTES / (1024 * 1024))) * 1024 * 1024)
+    except (TypeError, ValueError):
+        pass
+    return cache
@@ -0,0 +1,243 @@
+import re
+
+from bs4 import CData, NavigableString
+
+from .text_cleaner import clean_control_text
+
+# Parti di pagina da escludere dal testo dell'articolo
+UNWANTED_SELECTORS = [
+    'script', 'style', 'nav', 'header', 'footer',
+    '.advertisement', '.ads', '.social-share', '.related-articles',
+    '.sidebar', '.comments', '.recommendations', '.newsletter',
+    '.breadcrumb', '.navigation', '.menu', '.footer',
+    '.header', '.top-bar', '.bottom-bar', '.social-media',
+    '.share-buttons', '.tags', '.categories', '.author-bio',
+    '.related-content', '.more-articles', '.trending',
+    '.popular', '.latest', '.breaking', '.featured'
+]
+
+def compile_unwanted(selectors):
+    """Divide i selettori semplici ('tag' o '.classe') in un insieme di tag e uno di classi"""
+    tags, classes = set(), set()
+    for selector in selectors:
+        if selector.startswith('.'):
+            classes.add(selector[1:])
+        else:
+            tags.add(selector)
+    return frozenset(tags), frozenset(classes)
+
+UNWANTED_TAGS, UNWANTED_CLASSES = compile_unwanted(UNWANTED_SELECTORS)
+
+def pruned_text(element, unwanted_tags=UNWANTED_TAGS, unwanted_classes=UNWANTED_CLASSES, block_tags=None,
+                budget=None):
+    """Testo di element senza le parti indesiderate, in una sola visita dell'albero.
+    
+    Equivale a rimuovere con decompose() i discendenti che corrispondono ai selettori
+    e poi chiamare get_text(), ma non modifica l'albero: i sottoalberi scartati non
+    vengono nemmeno visitati. Con block_tags inserisce uno spazio all'inizio di ogni
+    elemento di blocco, così i paragrafi adiacenti non restano incollati. Con budget
+    la visita si ferma appena il testo raccolto supera budget caratteri.
+    """
+    string_types = element.interesting_string_types or (NavigableString, CData)
+    if isinstance(string_types, type):
+        string_types = (string_types,)
+    
+    parts = []
+    length = 0
+    stack = list(reversed(element.contents))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, NavigableString):
+            if type(node) in string_types:
+                parts.append(node)
+                if budget is not None:
+                    # Gli spazi in eccesso vengono poi compressi: si contano solo quelli utili
+                    length += len(node.strip()) + 1
+                    if length >= budget:
+                        break
+            continue
+        if node.name in unwanted_tags:
+            continue
+        classes = node.get('class')
+        if classes and not unwanted_classes.isdisjoint(classes):
+            continue
+        if block_tags and node.name in block_tags:
+            parts.append(' ')
+        stack.extend(reversed(node.contents))
+    return ''.join(parts)
+
+def truncate_text(text, budget):
+    """Accorcia text a budget caratteri, alla fine di una frase o di una parola, segnalando il taglio"""
+    if not budget or len(text) <= budget:
+        return text
+    cut = text[:budget]
+    sentence_end = max(cut.rfind('. '), cut.rfind('.\n'), cut.rfind('? '), cut.rfind('! '))
+    if sentence_end >= budget * 0.7:
+        return cut[:sentence_end + 1] + ' […]'
+    return cut.rsplit(' ', 1)[0] + ' […]'
+
+# Budget di testo per articolo e studio: ~4 caratteri per token nei prompt
+DEFAULT_CONTENT_BUDGET = 12000
+CHARS_PER_TOKEN = 4
+
+_content_budget = DEFAULT_CONTENT_BUDGET
+
+def get_content_budget():
+    """Numero massimo di caratteri estratti da un articolo o da uno studio"""
+    return _content_budget
+
+def configure_content_budget(settings):
+    """Imposta il budget dalla sezione [Network]: content_budget_chars oppure content_budget_tokens"""
+    global _content_budget
+    try:
+        if settings.get('content_budget_tokens'):
+            budget = int(float(settings['content_budget_tokens']) * CHARS_PER_TOKEN)
+        else:
+            budget = int(float(settings.get('content_budget_chars', DEFAULT_CONTENT_BUDGET)))
+    except (TypeError, ValueError):
+        budget = DEFAULT_CONTENT_BUDGET
+    _content_budget = max(budget, 500)
+    return _content_budget
+
+# Elementi che separano blocchi di testo distinti
+BLOCK_TAGS = frozenset({
+    'p', 'div', 'br', 'li', 'ul', 'ol', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'tr', 'td', 'th',
+    'blockquote', 'pre', 'section', 'article', 'figure', 'figcaption', 'table', 'dd', 'dt'
+})
+
+# Elementi che non contengono mai il corpo dell'articolo, esclusi anche dal calcolo della densità
+NON_CONTENT_TAGS = UNWANTED_TAGS | {'aside', 'form', 'noscript', 'iframe', 'svg', 'button', 'select', 'template'}
+
+# Blocchi di testo che contano come paragrafi nel punteggio
+PARAGRAPH_TAGS = {'p', 'pre', 'blockquote', 'td'}
+
+_POSITIVE_RE = re.compile(r'article|body|content|entry|main|page|post|text|story|news|testo|articolo', re.I)
+_NEGATIVE_RE = re.compile(r'comment|footer|sidebar|share|social|related|promo|advert|banner|menu|nav|widget|'
+                          r'cookie|newsletter|breadcrumb|teaser|card|correlat|commenti|disqus|reply|author-bio', re.I)
+
+def _class_weight(node):
+    """Peso dato da classi e id: +25 se sembrano contenuto, -25 se sembrano accessori"""
+    label = ' '.join(node.get('class') or ()) + ' ' + (node.get('id') or '')
+    if not label.strip():
+        return 0
+    weight = 0
+    if _NEGATIVE_RE.search(label):
+        weight -= 25
+    if _POSITIVE_RE.search(label):
+        weight += 25
+    return weight
+
+def extract_main_content(root, min_length=100, budget=None):
+    """Trova il corpo principale della pagina per densità di testo, senza selettori per dominio.
+    
+    Una sola visita dell'albero calcola per ogni elemento la lunghezza del testo, del
+    testo nei link e delle virgole; ogni paragrafo assegna un punteggio al genitore e
+    metà al nonno, come in Readability. Vince l'elemento con il punteggio più alto,
+    pesato per classi/id e penalizzato dalla densità di link; i fratelli con punteggio
+    vicino (o paragrafi lunghi con pochi link) vengono aggiunti al risultato.
+    Restituisce il testo ripulito (al più budget caratteri, se indicato), o None se
+    non si trova un corpo sufficiente.
+    """
+    string_types = root.interesting_string_types or (NavigableString, CData)
+    if isinstance(string_types, type):
+        string_types = (string_types,)
+    
+    scores = {}
+    stats = {}
+    final_scores = {}
+    best, best_score = None, 0.0
+    
+    # Frame: [nodo, testo, testo nei link, virgole, testo diretto]
+    frames = [[root, 0, 0, 0, 0]]
+    link_depth = 0
+    stack = [(child, False) for child in reversed(root.contents)]
+    while stack:
+        node, leaving = stack.pop()
+        
+        if leaving:
+            frame = frames.pop()
+            _, text_len, link_len, commas, direct_len = frame
+            parent = frames[-1]
+            parent[1] += text_len
+            parent[2] += link_len
+            parent[3] += commas
+            if node.name == 'a':
+                link_depth -= 1
+            
+            node_id = id(node)
+            stats[node_id] = (text_len, link_len)
+            is_paragraph = node.name in PARAGRAPH_TAGS or (node.name == 'div' and direct_len >= 80)
+            if is_paragraph and text_len - link_len >= 25:
+                contribution = 1 + commas + min(text_len // 100, 3)
+                parent_id = id(parent[0])
+                scores[parent_id] = scores.get(parent_id, 0) + contribution
+                if len(frames) > 1:
+                    grandparent_id = id(frames[-2][0])
+                    scores[grandparent_id] = scores.get(grandparent_id, 0) + contribution / 2
+                if node.name == 'div':
+                    # Un div con testo proprio è anch'esso un candidato
+                    scores[node_id] = scores.get(node_id, 0) + contribution
+            
+            if node_id in scores:
+                link_density = link_len / text_len if text_len else 1
+                score = (scores[node_id] + _class_weight(node)) * (1 - link_density)
+                final_scores[node_id] = score
+                if score > best_score:
+                    best, best_score = node, score
+            continue
+        
+        if isinstance(node, NavigableString):
+            if type(node) in string_types:
+                length = len(node.strip())
+                if length:
+                    frame = frames[-1]
+                    frame[1] += length
+                    frame[4] += length
+                    frame[3] += node.count(',')
+                    if link_depth:
+                        frame[2] += length
+            continue
+        
+        if node.name in NON_CONTENT_TAGS:
+            continue
+        classes = node.get('class')
+        if classes and not UNWANTED_CLASSES.isdisjoint(classes):
+            continue
+        
+        if node.name == 'a':
+            link_depth += 1
+        frames.append([node, 0, 0, 0, 0])
+        stack.append((node, True))
+        stack.extend((child, False) for child in reversed(node.contents))
+    
+    if best is None:
+        return None
+    
+    # Raggruppa i blocchi fratelli che appartengono allo stesso corpo
+    selected = [best]
+    if best.parent is not None:
+        threshold = max(10, best_score * 0.2)
+        selected = []
+        for sibling in best.parent.contents:
+            if isinstance(sibling, NavigableString):
+                continue
+            sibling_id = id(sibling)
+            if sibling is best or final_scores.get(sibling_id, 0) >= threshold:
+                selected.append(sibling)
+            elif sibling.name == 'p' and sibling_id in stats:
+                text_len, link_len = stats[sibling_id]
+                if text_len > 80 and link_len / text_len < 0.25:
+                    selected.append(sibling)
+    
+    # Il testo si raccoglie solo finché serve: oltre il budget i blocchi non vengono visitati
+    parts = []
+    remaining = budget
+    for node in selected:
+        if remaining is not None and remaining <= 0:
+            break
+        part = pruned_text(node, NON_CONTENT_TAGS, block_tags=BLOCK_TAGS, budget=remaining)
+        parts.append(part)
+        if remaining is not None:
+            remaining -= len(part)
+    text = truncate_text(clean_control_text(' '.join(parts)), budget)
+    return text if len(text) >= min_length else None
@@ -0,0 +1,302 @@
+import base64
+import hashlib
+import re
+from functools import lru_cache
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode, unquote
+
+from .text_cleaner import normalize_text
+
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    'ocid', 'cmpid', 'ito', 'rss', 'refresh_ce', 'at_medium', 'at_campaign',
+    'at_custom1', 'at_custom2', 'at_custom3', 'at_custom4', 'xtor', 'ns_mchannel',
+    'ns_source', 'ns_campaign', 'ns_linkname', 'ns_fee', 'spm', 'smid', 'cmp'
+}
+TRACKING_PREFIXES = ('utm_', 'ga_', 'pk_', 'mtm_', 'hsa_')
+
+GOOGLE_REDIRECT_HOSTS = {'google.com', 'www.google.com', 'google.it', 'www.google.it', 'news.google.com'}
+
+SIMHASH_BITS = 64
+
+# Storie confrontate al massimo per ogni banda dell'indice incrementale
+BUCKET_CANDIDATES = 64
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+_EMBEDDED_URL_RE = re.compile(rb'https?://[\x21-\x7e]+')
+
+def _decode_google_news_id(article_id):
+    """Decodifica gli ID base64 di Google News che contengono direttamente l'URL"""
+    try:
+        padded = article_id + '=' * (-len(article_id) % 4)
+        decoded = base64.urlsafe_b64decode(padded)
+    except (ValueError, TypeError):
+        return None
+    
+    match = _EMBEDDED_URL_RE.search(decoded)
+    if not match:
+        return None
+    
+    return match.group().decode('ascii')
+
+def resolve_google_redirect(url):
+    """Risolve i redirect di Google/Google News quando l'URL finale è ricavabile offline"""
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    if host not in GOOGLE_REDIRECT_HOSTS:
+        return url
+    
+    if parsed.path == '/url':
+        params = dict(parse_qsl(parsed.query))
+        target = params.get('url') or params.get('q')
+        if target and target.startswith(('http://', 'https://')):
+            return unquote(target)
+    
+    if host == 'news.google.com' and '/articles/' in parsed.path:
+        article_id = parsed.path.rstrip('/').rsplit('/', 1)[-1]
+        target = _decode_google_news_id(article_id)
+        if target:
+            return target
+    
+    return url
+
+def _without_tracking(query):
+    return [
+        (key, value) for key, value in parse_qsl(query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+
+def clean_link(url):
+    """Link da mostrare/aprire: redirect risolti e parametri di tracciamento rimossi, host invariato"""
+    if not url:
+        return ""
+    
+    url = resolve_google_redirect(url.strip())
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return url
+    
+    if not parsed.netloc or not parsed.query:
+        return url
+    return urlunparse(parsed._replace(query=urlencode(_without_tracking(parsed.query))))
+
+def canonicalize_url(url):
+    """Chiave canonica di un link: risolve i redirect, rimuove tracciamento, frammenti e 'www.'"""
+    if not url:
+        return ""
+    
+    url = resolve_google_redirect(url.strip())
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return url
+    
+    if not parsed.netloc:
+        return url
+    
+    host = parsed.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if host.endswith(':80') or host.endswith(':443'):
+        host = host.rsplit(':', 1)[0]
+    
+    query = _without_tracking(parsed.query)
+    query.sort()
+    
+    path = parsed.path or '/'
+    if len(path) > 1 and path.endswith('/'):
+        path = path.rstrip('/')
+    
+    return urlunparse((parsed.scheme.lower(), host, path, parsed.params, urlencode(query), ''))
+
+@lru_cache(maxsize=65536)
+def _feature_hash(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def simhash(text):
+    """Calcola la SimHash a 64 bit delle parole di un testo (None se non ci sono parole utili)"""
+    tokens = [token for token in _WORD_RE.findall(text.lower()) if len(token) > 2 or token.isdigit()]
+    if not tokens:
+        return None
+    
+    weights = [0] * SIMHASH_BITS
+    for token in tokens:
+        h = _feature_hash(token)
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+    
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+def _article_words(article, min_title_words=4, summary_words=20):
+    """Parole che identificano un articolo: il titolo, integrato dal sommario se troppo corto"""
+    title = normalize_text(article.get('title', ''))
+    # Google News accoda " - Nome testata" ai titoli: non fa parte della notizia
+    head, sep, tail = title.rpartition(' - ')
+    if sep and head and len(tail.split()) <= 4:
+        title = head
+    
+    words = title.split()
+    if len(words) < min_title_words:
+        words += normalize_text(article.get('summary', '')).split()[:summary_words]
+    return ' '.join(words)
+
+def _article_fingerprint(article):
+    """Impronta SimHash di un articolo e numeri che compaiono nel suo testo"""
+    text = _article_words(article)
+    numbers = frozenset(token for token in _WORD_RE.findall(text) if token.isdigit())
+    return simhash(text), numbers
+
+def _numbers_compatible(a, b):
+    """Titoli con numeri diversi (estrazioni, risultati, date) sono notizie diverse"""
+    return not a or not b or a <= b or b <= a
+
+def _band_keys(fingerprint, max_distance):
+    """Chiavi LSH di un'impronta: con b bande, due impronte a distanza <= b-1 condividono almeno una banda"""
+    bands = max_distance + 1
+    band_bits = SIMHASH_BITS // bands
+    band_mask = (1 << band_bits) - 1
+    return [(band, (fingerprint >> (band * band_bits)) & band_mask) for band in range(bands)]
+
+class StoryIndex:
+    """Indice incrementale delle storie già note, per unire le notizie in arrivo nel tempo.
+    
+    Conserva per ogni storia il link del rappresentante, le fonti e l'impronta SimHash
+    nelle bande LSH, così ogni nuovo articolo si confronta solo con le storie candidate.
+    """
+    
+    def __init__(self, max_distance=8):
+        self.max_distance = max_distance
+        self._links = {}
+        self._buckets = {}
+        self._stories = []
+    
+    def __len__(self):
+        return len(self._stories)
+    
+    def knows_link(self, link):
+        return canonicalize_url(link) in self._links
+    
+    def story(self, story_id):
+        """Link del rappresentante, fonti e numero di fonti di una storia"""
+        _, _, link, sources, count = self._stories[story_id]
+        return {'link': link, 'sources': list(sources), 'source_count': max(count, len(sources), 1)}
+    
+    def _match(self, fingerprint, numbers):
+        checked = set()
+        for key in _band_keys(fingerprint, self.max_distance):
+            # Solo le storie più recenti di ogni banda: titoli ripetitivi (estrazioni, meteo) riempiono le stesse bande
+            for story_id in reversed(self._buckets.get(key, [])[-BUCKET_CANDIDATES:]):
+                if story_id in checked:
+                    continue
+                checked.add(story_id)
+                other, other_numbers = self._stories[story_id][:2]
+                if hamming_distance(fingerprint, other) <= self.max_distance and _numbers_compatible(numbers, other_numbers):
+                    return story_id
+        return None
+    
+    def add(self, article):
+        """Inserisce un articolo e restituisce (id della storia, True se la storia è nuova, True se è cambiata).
+        
+        Un link già noto non cambia nulla; un articolo simile a una storia nota vi viene
+        aggiunto come fonte, altrimenti diventa il rappresentante di una nuova storia.
+        """
+        link = canonicalize_url(article.get('link', ''))
+        if link and link in self._links:
+            return self._links[link], False, False
+        
+        fingerprint, numbers = _article_fingerprint(article)
+        story_id = self._match(fingerprint, numbers) if fingerprint is not None else None
+        source = article.get('source', '')
+        if story_id is None:
+            story_id = len(self._stories)
+            sources = list(article.get('sources') or ([source] if source else []))
+            count = article.get('source_count', 1) or 1
+            self._stories.append([fingerprint, numbers, clean_link(article.get('link', '')), sources, count])
+            if fingerprint is not None:
+                for key in _band_keys(fingerprint, self.max_distance):
+                    self._buckets.setdefault(key, []).append(story_id)
+            created = changed = True
+        else:
+            story = self._stories[story_id]
+            created = False
+            changed = bool(source) and source not in story[3]
+            if changed:
+                story[3].append(source)
+                story[4] += 1
+        if link:
+            self._links[link] = story_id
+        return story_id, created, changed
+
+def dedupe_articles(articles, max_distance=8):
+    """Raggruppa gli articoli che raccontano la stessa notizia e ne restituisce uno per storia.
+    
+    I link uguali dopo la canonicalizzazione vengono uniti subito; i titoli/sommari
+    quasi identici vengono trovati con SimHash e LSH a bande, senza confronti a coppie
+    su tutto l'insieme. Ogni articolo restituito riporta 'source_count' e 'sources'.
+    """
+    if not articles:
+        return []
+    
+    n = len(articles)
+    parent = list(range(n))
+    
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    def union(i, j):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+    
+    canonical_links = [canonicalize_url(article.get('link', '')) for article in articles]
+    seen_links = {}
+    for i, link in enumerate(canonical_links):
+        if not link:
+            continue
+        if link in seen_links:
+            union(i, seen_links[link])
+        else:
+            seen_links[link] = i
+    
+    fingerprints = [_article_fingerprint(article) for article in articles]
+    buckets = {}
+    for i, (fingerprint, numbers) in enumerate(fingerprints):
+        if fingerprint is None:
+            continue
+        for key in _band_keys(fingerprint, max_distance):
+            for j in buckets.setdefault(key, []):
+                other, other_numbers = fingerprints[j]
+                if (find(i) != find(j) and hamming_distance(fingerprint, other) <= max_distance
+                        and _numbers_compatible(numbers, other_numbers)):
+                    union(i, j)
+            buckets[key].append(i)
+    
+    clusters = {}
+    for i in range(n):
+        clusters.setdefault(find(i), []).append(i)
+    
+    deduped = []
+    for root in sorted(clusters):
+        members = clusters[root]
+        representative = articles[members[0]].copy()
+        representative['link'] = clean_link(representative.get('link', ''))
+        sources = []
+        for member in members:
+            source = articles[member].get('source', '')
+            if source and source not in sources:
+                sources.append(source)
+        representative['sources'] = sources
+        representative['source_count'] = max(len(sources), 1)
+        deduped.append(representative)
+    
+    return deduped
@@ -0,0 +1,74 @@
+import threading
+from pathlib import Path
+
+from .models import Article
+from .settings import get_data_dir
+from .storage import load_json, process_singleton, save_json
+
+# Da incrementare quando cambia il formato degli articoli salvati
+CACHE_VERSION = 2
+
+class FeedCache:
+    """Cache persistente dei feed RSS basata su ETag/Last-Modified"""
+    
+    def __init__(self, path=None):
+        self.path = Path(path) if path else get_data_dir() / "feed_cache.json"
+        self._lock = threading.Lock()
+        self._entries = self._load()
+    
+    def _load(self):
+        """Voci della cache su disco, scartate se salvate con un formato precedente"""
+        data = load_json(self.path)
+        return data.get('feeds', {}) if data.get('version') == CACHE_VERSION else {}
+    
+    def _save(self):
+        save_json(self.path, {'version': CACHE_VERSION, 'feeds': self._entries})
+    
+    def get(self, feed_url):
+        """Restituisce la voce in cache per un feed, se presente"""
+        with self._lock:
+            return self._entries.get(feed_url)
+    
+    def conditional_headers(self, feed_url):
+        """Costruisce gli header If-None-Match/If-Modified-Since per il feed"""
+        entry = self.get(feed_url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def can_serve(self, feed_url, max_items=None):
+        """Indica se la voce in cache basta a rispondere a una richiesta con questo limite"""
+        entry = self.get(feed_url)
+        if not entry:
+            return False
+        if not entry.get('truncated'):
+            return True
+        return max_items is not None and len(entry.get('articles', [])) >= max_items
+    
+    def get_articles(self, feed_url):
+        """Restituisce una copia degli articoli in cache per il feed"""
+        entry = self.get(feed_url)
+        if not entry:
+            return None
+        return [Article.from_dict(article) for article in entry.get('articles', [])]
+    
+    def store(self, feed_url, etag, last_modified, articles, truncated=False):
+        """Salva validatori e articoli analizzati di un feed"""
+        with self._lock:
+            self._entries[feed_url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'articles': [article.to_dict() if isinstance(article, Article) else dict(article) for article in articles],
+                'truncated': truncated
+            }
+            self._save()
+
+_feed_cache = process_singleton(FeedCache)
+
+def get_feed_cache():
+    """Restituisce la cache dei feed condivisa dal processo"""
+    return _feed_cache()
@@ -0,0 +1,148 @@
+import threading
+import time
+from pathlib import Path
+
+from .settings import get_data_dir
+from .storage import load_json, process_singleton, save_json
+
+HEALTH_WINDOW = 50
+FAILURE_THRESHOLD = 3
+BASE_COOLDOWN = 300
+MAX_COOLDOWN = 6 * 3600
+
+# Limiti del timeout di lettura adattivo (secondi)
+MIN_TIMEOUT = 3
+MAX_TIMEOUT = 10
+
+class CircuitOpenError(Exception):
+    """Il feed è sospeso dal circuit breaker e non va interrogato"""
+
+def _percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+class FeedHealth:
+    """Stato di salute dei feed con circuit breaker, salvato su disco tra un avvio e l'altro.
+    
+    Dopo FAILURE_THRESHOLD errori consecutivi il circuito si apre e il feed viene
+    saltato per un periodo di raffreddamento che raddoppia a ogni nuova apertura.
+    Scaduto il periodo, un solo tentativo di prova (half-open) decide se richiuderlo.
+    """
+    
+    def __init__(self, path=None):
+        self.path = Path(path) if path else get_data_dir() / "feed_health.json"
+        self._lock = threading.Lock()
+        self._entries = load_json(self.path)
+        self._probing = set()
+    
+    def _entry(self, feed_url):
+        return self._entries.setdefault(feed_url, {
+            'outcomes': [],
+            'latencies': [],
+            'successes': 0,
+            'failures': 0,
+            'consecutive_failures': 0,
+            'trips': 0,
+            'open_until': 0,
+            'last_error': None,
+            'last_error_at': None,
+            'last_success_at': None
+        })
+    
+    def state(self, feed_url):
+        """Stato del circuito: 'closed', 'open' oppure 'half_open'"""
+        with self._lock:
+            entry = self._entries.get(feed_url)
+            if not entry or not entry['open_until']:
+                return 'closed'
+            return 'open' if time.time() < entry['open_until'] else 'half_open'
+    
+    def allow_request(self, feed_url):
+        """Indica se il feed può essere interrogato; in half-open lascia passare una sola prova"""
+        with self._lock:
+            entry = self._entries.get(feed_url)
+            if not entry or not entry['open_until']:
+                return True
+            if time.time() < entry['open_until'] or feed_url in self._probing:
+                return False
+            self._probing.add(feed_url)
+            return True
+    
+    def retry_in(self, feed_url):
+        """Secondi mancanti alla prossima prova di un feed sospeso"""
+        with self._lock:
+            entry = self._entries.get(feed_url)
+            if not entry:
+                return 0
+            return max(0, entry['open_until'] - time.time())
+    
+    def timeout_for(self, feed_url, default=MAX_TIMEOUT):
+        """Timeout di lettura adattato alla latenza osservata (p95 con margine)"""
+        with self._lock:
+            entry = self._entries.get(feed_url)
+            latencies = list(entry['latencies']) if entry else []
+        if len(latencies) < 5:
+            return default
+        p95 = _percentile(latencies, 0.95)
+        return min(default, max(MIN_TIMEOUT, p95 * 3))
+    
+    def record_success(self, feed_url, latency):
+        with self._lock:
+            entry = self._entry(feed_url)
+            self._push(entry, 1, latency)
+            entry['successes'] += 1
+            entry['consecutive_failures'] = 0
+            entry['trips'] = 0
+            entry['open_until'] = 0
+            entry['last_success_at'] = time.time()
+            self._probing.discard(feed_url)
+            save_json(self.path, self._entries)
+    
+    def record_failure(self, feed_url, error):
+        with self._lock:
+            entry = self._entry(feed_url)
+            self._push(entry, 0, None)
+            entry['failures'] += 1
+            entry['consecutive_failures'] += 1
+            entry['last_error'] = str(error)[:300]
+            entry['last_error_at'] = time.time()
+            half_open = feed_url in self._probing
+            self._probing.discard(feed_url)
+            if half_open or entry['consecutive_failures'] >= FAILURE_THRESHOLD:
+                entry['trips'] += 1
+                cooldown = min(MAX_COOLDOWN, BASE_COOLDOWN * 2 ** (entry['trips'] - 1))
+                entry['open_until'] = time.time() + cooldown
+            save_json(self.path, self._entries)
+    
+    def _push(self, entry, outcome, latency):
+        entry['outcomes'] = (entry['outcomes'] + [outcome])[-HEALTH_WINDOW:]
+        if latency is not None:
+            entry['latencies'] = (entry['latencies'] + [round(latency, 3)])[-HEALTH_WINDOW:]
+    
+    def summary(self):
+        """Riepilogo per feed: tasso di successo, latenze p50/p95, ultimo errore e stato"""
+        with self._lock:
+            entries = {url: dict(entry) for url, entry in self._entries.items()}
+        
+        result = {}
+        for url, entry in entries.items():
+            outcomes = entry['outcomes']
+            p50 = _percentile(entry['latencies'], 0.5)
+            p95 = _percentile(entry['latencies'], 0.95)
+            result[url] = {
+                'success_rate': round(sum(outcomes) / len(outcomes), 2) if outcomes else None,
+                'p50_ms': round(p50 * 1000) if p50 is not None else None,
+                'p95_ms': round(p95 * 1000) if p95 is not None else None,
+                'last_error': entry['last_error'],
+                'state': self.state(url)
+            }
+        return result
+
+_feed_health = process_singleton(FeedHealth)
+
+def get_feed_health():
+    """Restituisce lo stato di salute dei feed condiviso dal processo"""
+    return _feed_health()
@@ -1,81 +1,188 @@
-
-import requests
 from xml.etree import ElementTree as ET
-import re
-import html
-from datetime import datetime
+import heapq
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from urllib.parse import urlparse
 
-def fetch_articles(feed_url, user_agent="Mozilla/5.0"):
-    res = requests.get(feed_url, timeout=10, headers={"User-Agent": user_agent})
-    res.raise_for_status()
-    root = ET.fromstring(res.text)
-    articles = []
-    for item in root.findall('.//item'):
-        title = item.findtext('title', '')
-        link = item.findtext('link', '')
-        pubDate = item.findtext('pubDate', '')
-        description = item.findtext('description', '')
-        source_el = item.find('source')
-        author = source_el.text if source_el is not None else ""
-        
-        clean_descr = re.sub('<[^<]+?>', '', description)
-        clean_descr = html.unescape(clean_descr)
-        clean_descr = re.sub(r'&[a-zA-Z0-9#]+;', '', clean_descr)
-        clean_descr = re.sub(r'\s+', ' ', clean_descr)
-        
-        clean_title = html.unescape(title)
-        clean_title = re.sub(r'&[a-zA-Z0-9#]+;', '', clean_title)
-        clean_title = re.sub(r'\s+', ' ', clean_title)
-        
-        clean_author = html.unescape(author)
-        clean_author = re.sub(r'&[a-zA-Z0-9#]+;', '', clean_author)
-        clean_author = re.sub(r'\s+', ' ', clean_author)
+from .dedup import dedupe_articles
+from .feed_cache import get_feed_cache
+from .feed_health import CircuitOpenError, get_feed_health
+from .http_client import get_http_client
+from .models import Article
+from .rate_limiter import HostLimiter
+from .text_cleaner import normalize_text, normalize_many
+
+FEED_CHUNK_SIZE = 16 * 1024
+
+DEFAULT_SOURCES = [
+    'https://www.ansa.it/sito/ansait_rss.xml',
+    'https://www.repubblica.it/rss/homepage/rss2.0.xml',
+    'https://www.corriere.it/rss/homepage.xml',
+    'https://www.ilsole24ore.com/rss/homepage.xml',
+    'https://feeds.reuters.com/reuters/topNews',
+    'https://feeds.bbci.co.uk/news/rss.xml'
+]
+
+def fetch_articles(feed_url, user_agent="Mozilla/5.0", use_cache=True, max_items=None, timeout=10):
+    cache = get_feed_cache() if use_cache else None
+    headers = {"User-Agent": user_agent}
+    if cache is not None and cache.can_serve(feed_url, max_items):
+        headers.update(cache.conditional_headers(feed_url))
+    
+    client = get_http_client()
+    res = client.get(feed_url, timeout=timeout, headers=headers, stream=True)
+    try:
+        if res.status_code == 304 and cache is not None:
+            cached_articles = cache.get_articles(feed_url)
+            if cached_articles is not None:
+                return cached_articles[:max_items] if max_items else cached_articles
+            # Voce sparita dalla cache: ripete la richiesta senza validatori
+            res.close()
+            res = client.get(feed_url, timeout=timeout, headers={"User-Agent": user_agent}, stream=True)
+        res.raise_for_status()
         
-        articles.append({
-            "title": clean_title.strip(),
-            "date": pubDate.strip(),
-            "author": clean_author.strip(),
-            "summary": clean_descr.strip(),
-            "link": link.strip(),
-            "source": extract_source_from_url(link.strip()),
-            "parsed_date": parse_date(pubDate.strip())
-        })
+        articles = list(iter_feed_items(res.iter_content(chunk_size=FEED_CHUNK_SIZE), max_items))
+    finally:
+        res.close()
+    
+    if cache is not None:
+        truncated = max_items is not None and len(articles) >= max_items
+        cache.store(feed_url, res.headers.get('ETag'), res.headers.get('Last-Modified'), articles, truncated)
+    return articles
+
+def iter_feed_items(chunks, max_items=None):
+    """Analizza un feed RSS in streaming e restituisce gli articoli uno alla volta"""
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    open_elements = []
+    count = 0
+    
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == 'start':
+                open_elements.append(elem)
+                continue
+            
+            open_elements.pop()
+            if elem.tag != 'item':
+                continue
+            
+            article = _parse_item(elem)
+            # Libera la memoria: l'item elaborato non serve più all'albero
+            elem.clear()
+            if open_elements:
+                open_elements[-1].remove(elem)
+            
+            yield article
+            count += 1
+            if max_items is not None and count >= max_items:
+                return
+    
+    parser.close()
+
+def _parse_item(item):
+    """Converte un elemento <item> del feed in un Article"""
+    title = item.findtext('title', '')
+    link = item.findtext('link', '').strip()
+    source = extract_source_from_url(link)
+    pubDate = item.findtext('pubDate', '')
+    description = item.findtext('description', '')
+    source_el = item.find('source')
+    author = (source_el.text or "") if source_el is not None else ""
+    
+    clean_title, clean_author = normalize_many((title, author))
+    clean_descr = normalize_text(description, strip_tags=True)
+    
+    return Article(
+        title=clean_title,
+        date=pubDate.strip(),
+        author=clean_author,
+        summary=clean_descr,
+        link=link,
+        source=source,
+        parsed_date=parse_date(pubDate, source)
+    )
+
+def fetch_feed(feed_url, max_items=None):
+    """Scarica un feed passando dal circuit breaker e ne registra esito e latenza"""
+    health = get_feed_health()
+    if not health.allow_request(feed_url):
+        raise CircuitOpenError(feed_url)
+    
+    read_timeout = health.timeout_for(feed_url)
+    started = time.perf_counter()
+    try:
+        articles = fetch_articles(feed_url, max_items=max_items, timeout=(min(5, read_timeout), read_timeout))
+    except Exception as e:
+        health.record_failure(feed_url, e)
+        raise
+    health.record_success(feed_url, time.perf_counter() - started)
     return articles
 
-def fetch_multiple_sources(sources=None, max_articles_per_source=10):
-    """Recupera articoli da multiple fonti"""
+def fetch_multiple_sources(sources=None, max_articles_per_source=10, max_workers=8, per_host_limit=2, deadline=15, dedupe=True):
+    """Recupera articoli da multiple fonti in parallelo"""
     
     if sources is None:
-        sources = [
-            'https://www.ansa.it/sito/ansait_rss.xml',
-            'https://www.repubblica.it/rss/homepage/rss2.0.xml',
-            'https://www.corriere.it/rss/homepage.xml',
-            'https://www.ilsole24ore.com/rss/homepage.xml',
-            'https://feeds.reuters.com/reuters/topNews',
-            'https://feeds.bbci.co.uk/news/rss.xml'
-        ]
+        sources = DEFAULT_SOURCES
     
     all_articles = []
+    if not sources:
+        print("⚠️ Nessun articolo disponibile al momento")
+        return all_articles
     
-    for source_url in sources:
-        try:
-            source_name = extract_source_from_url(source_url)
-            print(f"📰 Recuperando da: {source_name}")
-            articles = fetch_articles(source_url)
+    source_streams = []
+    
+    host_limiter = HostLimiter(per_host_limit)
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(sources)))
+    futures = {
+        executor.submit(host_limiter.run, source_url, fetch_feed, source_url, max_items=max_articles_per_source): source_url
+        for source_url in sources
+    }
+    
+    print(f"📰 Recuperando da {len(sources)} fonti in parallelo...")
+    try:
+        # Unisce i risultati man mano che arrivano: il tempo totale è quello della fonte più lenta
+        for future in as_completed(futures, timeout=deadline):
+            source_name = extract_source_from_url(futures[future])
+            try:
+                articles = future.result()
+            except CircuitOpenError:
+                # Feed sospeso: si mostra l'ultima versione in cache, se c'è
+                articles = get_feed_cache().get_articles(futures[future]) or []
+                retry_minutes = max(1, round(get_feed_health().retry_in(futures[future]) / 60))
+                print(f"   ⏸️ {source_name}: sospeso dopo errori ripetuti, {len(articles[:max_articles_per_source])} articoli dalla cache (nuovo tentativo tra {retry_minutes} min)")
+                if articles:
+                    source_streams.append(sorted(articles[:max_articles_per_source], key=_sort_key, reverse=True))
+                continue
+            except Exception:
+                print(f"   ⚠️ {source_name}: non disponibile")
+                continue
+            
             if articles:
-                all_articles.extend(articles[:max_articles_per_source])
-                print(f"   ✅ {len(articles[:max_articles_per_source])} articoli recuperati")
+                # I feed sono già quasi ordinati: timsort su ciascuno costa circa O(n)
+                source_streams.append(sorted(articles[:max_articles_per_source], key=_sort_key, reverse=True))
+                print(f"   ✅ {source_name}: {len(articles[:max_articles_per_source])} articoli recuperati")
             else:
-                print(f"   ⚠️ Nessun articolo trovato")
-            time.sleep(1)  # Pausa per non sovraccaricare i server
-        except Exception:
-            source_name = extract_source_from_url(source_url)
-            print(f"   ⚠️ {source_name}: non disponibile")
-            continue  # Continua con la prossima fonte
+                print(f"   ⚠️ {source_name}: nessun articolo trovato")
+    except FuturesTimeoutError:
+        for future, source_url in futures.items():
+            if not future.done():
+                print(f"   ⚠️ {extract_source_from_url(source_url)}: tempo scaduto")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    all_articles = merge_sorted_articles(*source_streams)
+    
+    # Il raggruppamento mantiene l'ordine: per ogni storia resta la versione più recente
+    if all_articles and dedupe:
+        fetched_count = len(all_articles)
+        all_articles = dedupe_articles(all_articles)
+        if len(all_articles) < fetched_count:
+            print(f"🔁 {fetched_count - len(all_articles)} duplicati raggruppati in {len(all_articles)} notizie")
     
     if all_articles:
-        all_articles.sort(key=lambda x: x.get('parsed_date', ''), reverse=True)
         print(f"✅ Caricamento completato: {len(all_articles)} articoli da {len(set(article.get('source', '') for article in all_articles))} fonti")
     else:
         print("⚠️ Nessun articolo disponibile al momento")
@@ -103,34 +210,63 @@ def extract_source_from_url(url):
             return name
     
     try:
-        from urllib.parse import urlparse
         domain = urlparse(url).netloc
         return domain.replace('www.', '')
     except:
         return "Sconosciuto"
 
-def parse_date(date_string):
-    """Converte la data in formato standard"""
+DATE_FORMATS = [
+    '%a, %d %b %Y %H:%M:%S %z',
+    '%a, %d %b %Y %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S%z',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d'
+]
+
+# Ultimo formato riuscito per ciascuna fonte: gli item di un feed usano quasi sempre lo stesso
+_date_format_memo = {}
+
+def _parse_with(kind, date_string):
+    if kind == 'rfc822':
+        return parsedate_to_datetime(date_string)
+    if kind == 'iso':
+        return datetime.fromisoformat(date_string.replace('Z', '+00:00'))
+    return datetime.strptime(date_string, kind)
+
+def parse_datetime(date_string, source=None):
+    """Converte una data RFC-822/ISO-8601 in un datetime UTC, o None se non riconosciuta"""
     if not date_string:
-        return ''
+        return None
     
-    try:
-        formats = [
-            '%a, %d %b %Y %H:%M:%S %z',
-            '%a, %d %b %Y %H:%M:%S',
-            '%Y-%m-%dT%H:%M:%S%z',
-            '%Y-%m-%dT%H:%M:%S',
-            '%Y-%m-%d'
-        ]
-        
-        for fmt in formats:
-            try:
-                parsed_date = datetime.strptime(date_string, fmt)
-                return parsed_date.strftime('%Y-%m-%d')
-            except ValueError:
-                continue
-        
-        return ''
-        
-    except Exception:
-        return ''
+    date_string = date_string.strip()
+    memo_kind = _date_format_memo.get(source)
+    kinds = ['rfc822', 'iso'] + DATE_FORMATS
+    if memo_kind:
+        kinds.remove(memo_kind)
+        kinds.insert(0, memo_kind)
+    
+    for kind in kinds:
+        try:
+            parsed = _parse_with(kind, date_string)
+        except (TypeError, ValueError, IndexError):
+            continue
+        if source is not None:
+            _date_format_memo[source] = kind
+        # Le date senza fuso orario vengono considerate UTC
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.astimezone(timezone.utc)
+    
+    return None
+
+def parse_date(date_string, source=None):
+    """Converte la data in formato standard (ISO-8601 UTC, ordinabile come stringa)"""
+    parsed = parse_datetime(date_string, source)
+    return parsed.isoformat() if parsed else ''
+
+def _sort_key(article):
+    return article.get('parsed_date', '')
+
+def merge_sorted_articles(*streams):
+    """Fonde flussi di articoli già ordinati (dal più recente) con un heap, senza riordinare tutto"""
+    return list(heapq.merge(*streams, key=_sort_key, reverse=True))
@@ -0,0 +1,23 @@
+from bs4 import BeautifulSoup, FeatureNotFound
+
+# Backend in ordine di preferenza: lxml (C) se installato, altrimenti il parser della libreria standard
+PREFERRED_PARSERS = ('lxml', 'html.parser')
+
+def _detect_parser():
+    for parser in PREFERRED_PARSERS:
+        try:
+            BeautifulSoup("<p></p>", parser)
+            return parser
+        except FeatureNotFound:
+            continue
+    return 'html.parser'
+
+HTML_PARSER = _detect_parser()
+
+def parse_html(content, parser=None):
+    """Analizza una pagina HTML con il backend più veloce disponibile.
+    
+    Restituisce sempre un albero BeautifulSoup, così gli helper di estrazione
+    (select, find_all, get_text...) funzionano allo stesso modo con ogni backend.
+    """
+    return BeautifulSoup(content, parser or HTML_PARSER)
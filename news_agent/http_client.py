@@ -0,0 +1,223 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 20
+DEFAULT_POOL_CONNECTIONS = 32
+DEFAULT_POOL_MAXSIZE = 8
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.5
+DEFAULT_MAX_BODY_BYTES = 3 * 1024 * 1024
+BODY_CHUNK_SIZE = 64 * 1024
+
+# Attese massime tra due tentativi (secondi): un Retry-After di minuti bloccherebbe il thread
+MAX_BACKOFF = 4
+MAX_RETRY_AFTER = 5
+
+# Marcatori che indicano che il documento HTML è terminato
+HTML_END_MARKERS = (b'</body>', b'</html>')
+
+# Codici per cui ha senso ripetere una richiesta idempotente
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class BoundedRetry(Retry):
+    """Retry con attesa limitata sia per il backoff esponenziale sia per Retry-After"""
+    
+    def __init__(self, *args, max_backoff=MAX_BACKOFF, max_retry_after=MAX_RETRY_AFTER, **kwargs):
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        super().__init__(*args, **kwargs)
+    
+    def new(self, **kwargs):
+        # Retry è immutabile: ogni tentativo crea una copia che deve conservare i limiti
+        retry = super().new(**kwargs)
+        retry.max_backoff = self.max_backoff
+        retry.max_retry_after = self.max_retry_after
+        return retry
+    
+    def get_backoff_time(self):
+        return min(self.max_backoff, super().get_backoff_time())
+    
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, self.max_retry_after)
+
+class HttpClient:
+    """Client HTTP condiviso da tutti i moduli.
+    
+    Una sola requests.Session con un pool di connessioni keep-alive per host,
+    timeout di default (connessione, lettura) e retry con backoff esponenziale
+    (attese limitate a MAX_BACKOFF e MAX_RETRY_AFTER secondi).
+    I retry sugli stati HTTP valgono solo per i metodi idempotenti; gli errori di
+    connessione vengono ripetuti anche per le POST, perché la richiesta non è partita.
+    """
+    
+    def __init__(self, connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 retries=DEFAULT_RETRIES, backoff_factor=DEFAULT_BACKOFF, user_agent="Mozilla/5.0",
+                 max_body_bytes=DEFAULT_MAX_BODY_BYTES):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_body_bytes = max_body_bytes
+        self._lock = threading.Lock()
+        self._host_stats = {}
+        
+        retry = BoundedRetry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        # pool_connections = quanti host tenere in cache, pool_maxsize = connessioni per host
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                   max_retries=retry, pool_block=False)
+        self.session = requests.Session()
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+        self.session.headers.update({'User-Agent': user_agent, 'Connection': 'keep-alive'})
+    
+    def request(self, method, url, timeout=None, **kwargs):
+        """Esegue una richiesta con il timeout di default se non specificato"""
+        if timeout is None:
+            timeout = self.timeout
+        host = urlparse(url).netloc.lower()
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, url, timeout=timeout, **kwargs)
+        except requests.RequestException:
+            self._record(host, time.perf_counter() - started, error=True)
+            raise
+        
+        retries = getattr(getattr(response.raw, 'retries', None), 'history', ())
+        self._record(host, time.perf_counter() - started, error=response.status_code >= 500, retries=len(retries))
+        return response
+    
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+    
+    def head(self, url, **kwargs):
+        kwargs.setdefault('allow_redirects', True)
+        return self.request('HEAD', url, **kwargs)
+    
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+    
+    def read_body(self, response, max_bytes=None, end_markers=HTML_END_MARKERS):
+        """Legge in streaming il corpo di una risposta aperta con stream=True.
+        
+        Si ferma a max_bytes (il resto della pagina non viene scaricato) oppure appena
+        compare uno degli end_markers, senza attendere script e contenuti in coda.
+        Restituisce (corpo, troncato) e chiude la risposta: se la lettura si è
+        interrotta prima della fine la connessione viene scartata, altrimenti torna nel pool.
+        """
+        max_bytes = max_bytes or self.max_body_bytes
+        body = bytearray()
+        truncated = False
+        try:
+            for chunk in response.iter_content(chunk_size=BODY_CHUNK_SIZE):
+                # Il marcatore può trovarsi a cavallo tra due blocchi
+                search_from = max(0, len(body) - 16)
+                body.extend(chunk)
+                if len(body) >= max_bytes:
+                    truncated = len(body) > max_bytes
+                    del body[max_bytes:]
+                    break
+                if end_markers:
+                    tail = bytes(body[search_from:]).lower()
+                    if any(marker in tail for marker in end_markers):
+                        break
+        finally:
+            response.close()
+        return bytes(body), truncated
+    
+    def _record(self, host, elapsed, error=False, retries=0):
+        with self._lock:
+            stats = self._host_stats.setdefault(host, {'requests': 0, 'errors': 0, 'retries': 0, 'total_time': 0.0})
+            stats['requests'] += 1
+            stats['retries'] += retries
+            stats['total_time'] += elapsed
+            if error:
+                stats['errors'] += 1
+    
+    def pool_stats(self):
+        """Statistiche per host: richieste, errori, latenza media e riuso delle connessioni"""
+        pools = {}
+        poolmanager = self.adapter.poolmanager
+        # Copia delle chiavi: il pool manager può essere modificato da altri thread
+        for key in list(poolmanager.pools.keys()):
+            pool = poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            host = pool.host if pool.port in (None, 80, 443) else f"{pool.host}:{pool.port}"
+            entry = pools.setdefault(host.lower(), {'opened': 0, 'pooled_requests': 0, 'idle': 0})
+            entry['opened'] += pool.num_connections
+            entry['pooled_requests'] += pool.num_requests
+            entry['idle'] += sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0
+        
+        with self._lock:
+            host_stats = {host: dict(stats) for host, stats in self._host_stats.items()}
+        
+        result = {}
+        for host in set(pools) | set(host_stats):
+            stats = host_stats.get(host, {'requests': 0, 'errors': 0, 'retries': 0, 'total_time': 0.0})
+            pool = pools.get(host, {'opened': 0, 'pooled_requests': 0, 'idle': 0})
+            requests_count = stats['requests']
+            result[host] = {
+                'requests': requests_count,
+                'errors': stats['errors'],
+                'retries': stats['retries'],
+                'avg_ms': round(stats['total_time'] / requests_count * 1000, 1) if requests_count else None,
+                'connections_opened': pool['opened'],
+                'idle_connections': pool['idle'],
+                'reuse_ratio': round(1 - pool['opened'] / pool['pooled_requests'], 2) if pool['pooled_requests'] else None
+            }
+        return result
+    
+    def close(self):
+        self.session.close()
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_http_client():
+    """Restituisce il client HTTP condiviso, creandolo con i valori di default se serve"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
+
+def configure_http_client(settings):
+    """Ricrea il client condiviso con i parametri della sezione [Network] delle impostazioni"""
+    global _client
+    
+    def number(key, default, cast=float):
+        try:
+            return cast(settings.get(key, default))
+        except (TypeError, ValueError):
+            return default
+    
+    client = HttpClient(
+        connect_timeout=number('http_connect_timeout', DEFAULT_CONNECT_TIMEOUT),
+        read_timeout=number('http_read_timeout', DEFAULT_READ_TIMEOUT),
+        pool_connections=number('http_pool_hosts', DEFAULT_POOL_CONNECTIONS, int),
+        pool_maxsize=number('http_pool_maxsize', DEFAULT_POOL_MAXSIZE, int),
+        retries=number('http_retries', DEFAULT_RETRIES, int),
+        backoff_factor=number('http_backoff', DEFAULT_BACKOFF),
+        max_body_bytes=int(number('http_max_body_mb', DEFAULT_MAX_BODY_BYTES / (1024 * 1024)) * 1024 * 1024)
+    )
+    with _client_lock:
+        previous, _client = _client, client
+    if previous is not None:
+        previous.close()
+    return client
@@ -1,6 +1,14 @@
 
 from .settings import load_settings
-from .fetcher import fetch_articles, fetch_multiple_sources
+from .fetcher import fetch_articles, fetch_multiple_sources, merge_sorted_articles
+from .article_store import get_article_store
+from .content_cache import configure_content_cache
+from .content_extractor import configure_content_budget
+from .dedup import canonicalize_url
+from .http_client import configure_http_client
+from .rate_limiter import configure_rate_limiter
+from .scheduler import FeedScheduler
+from .models import Article
 
 from .critical_analyst import CriticalAnalyst
 from .article_scraper import ArticleScraper
@@ -17,6 +25,52 @@ def get_model_name(ai_provider):
         return ai_provider.model
     return "Modello sconosciuto"
 
+def start_feed_scheduler(settings, articles, article_store=None, initial_delay=None):
+    """Avvia il daemon che aggiorna i feed e inserisce le nuove notizie in tabella e archivio"""
+    if article_store:
+        on_new_articles = article_store.upsert_many
+        on_story_updates = article_store.update_sources
+        # Vista separata: il daemon indicizza tutto l'archivio senza toccare la cache di pagine della tabella
+        known_articles = article_store.articles()
+    else:
+        def on_new_articles(new_articles):
+            new_articles = sorted(new_articles, key=lambda x: x.get('parsed_date', ''), reverse=True)
+            merged = merge_sorted_articles(new_articles, list(articles))
+            # Sostituzione atomica: il ciclo dell'interfaccia non vede mai la lista a metà
+            articles[:] = merged
+        
+        def on_story_updates(updates):
+            by_link = {canonicalize_url(update['link']): update for update in updates}
+            for article in list(articles):
+                update = by_link.get(canonicalize_url(article.get('link', '')))
+                if update:
+                    article['sources'] = update['sources']
+                    article['source_count'] = update['source_count']
+        
+        known_articles = list(articles)
+    
+    feed_scheduler = FeedScheduler(
+        on_new_articles,
+        min_interval=int(settings.get("refresh_min_interval", 60)),
+        max_interval=int(settings.get("refresh_max_interval", 1800)),
+        initial_delay=initial_delay,
+        on_story_updates=on_story_updates
+    )
+    feed_scheduler.seed(known_articles)
+    feed_scheduler.start()
+    return feed_scheduler
+
+def find_article(articles, link, hint):
+    """Posizione attuale dell'articolo con questo link: la lista può cambiare mentre è a schermo"""
+    if not link:
+        return hint
+    if 0 <= hint < len(articles) and articles[hint].get('link') == link:
+        return hint
+    for i, article in enumerate(articles):
+        if article.get('link') == link:
+            return i
+    return min(hint, max(len(articles) - 1, 0))
+
 def handle_settings_menu(console):
     """Gestisce il menu delle impostazioni"""
     while True:
@@ -76,6 +130,10 @@ def main():
     provider = settings.get("provider", "ollama")
     serpapi_key = settings.get("serpapi_key")
     
+    configure_http_client(settings)
+    configure_rate_limiter(settings)
+    configure_content_cache(settings)
+    configure_content_budget(settings)
     console = Console()
     
 
@@ -88,24 +146,67 @@ def main():
         return
     
     critical_analyst = CriticalAnalyst()
+    scraper = ArticleScraper()
     
 
     
-    console.print("\n[bold yellow]📰 Caricamento notizie da multiple fonti...[/bold yellow]")
+    article_store = get_article_store(settings)
+    auto_refresh = settings.get("auto_refresh", "true").strip().lower() in ('1', 'true', 'yes', 'on')
+    
+    if article_store and auto_refresh and article_store.count() > 0:
+        # Avvio immediato dallo storico: i feed vengono aggiornati dal daemon in background
+        console.print("\n[bold yellow]📰 Notizie dall'archivio, aggiornamento in background...[/bold yellow]")
+        articles = article_store.articles()
+        refresh_delay = 0
+    else:
+        console.print("\n[bold yellow]📰 Caricamento notizie da multiple fonti...[/bold yellow]")
+        
+        articles = fetch_multiple_sources(max_articles_per_source=15)
+        
+        if article_store:
+            if articles:
+                article_store.upsert_many(articles)
+            # La tabella legge dall'archivio a pagine: include anche lo storico delle sessioni precedenti
+            articles = article_store.articles()
+        refresh_delay = None
     
-    articles = fetch_multiple_sources(max_articles_per_source=15)
     if not articles:
         console.print("[red]❌ Nessun articolo disponibile al momento[/red]")
         console.print("[dim]Riprova più tardi o verifica la connessione internet[/dim]")
         return
     
+    feed_scheduler = None
+    if auto_refresh:
+        feed_scheduler = start_feed_scheduler(settings, articles, article_store, refresh_delay)
+    
     current_page = 1
     total_pages = (len(articles) + per_page - 1) // per_page
     selected_idx = 0
+    selected_link = None
+    displayed = {}
+    redraw = True
 
     while True:
-        show_table(articles, current_page, per_page, selected_idx)
-        user_input = get_arrow_input()
+        if redraw:
+            total_pages = (len(articles) + per_page - 1) // per_page
+            shown = show_table(articles, current_page, per_page, selected_idx)
+            # Link degli articoli a schermo: i numeri mostrati restano validi anche se la lista cambia
+            page_start = (current_page - 1) * per_page
+            displayed = {page_start + i: article.get('link') for i, article in enumerate(shown)}
+            if selected_idx in displayed:
+                selected_link = displayed[selected_idx]
+            elif selected_idx < len(articles):
+                selected_link = articles[selected_idx].get('link')
+        redraw = True
+        user_input = get_arrow_input(timeout=1.0 if feed_scheduler else None)
+        
+        if user_input is None:
+            # Nessun tasto premuto: ridisegna solo se sono arrivate nuove notizie
+            redraw = feed_scheduler.consume_updates() > 0
+            continue
+        
+        # Il daemon può aver inserito notizie dopo l'ultimo disegno: ritrova l'articolo evidenziato
+        selected_idx = find_article(articles, selected_link, selected_idx)
 
         if user_input == 'q':
             break
@@ -166,11 +267,11 @@ def main():
                 if custom_text.strip():
                     console.print(f"\n[bold blue]🧠 Analizzando testo personalizzato...[/bold blue]")
                     
-                    article = {
+                    article = Article.from_dict({
                         'title': 'Testo personalizzato',
                         'content': custom_text,
                         'source': 'input_utente'
-                    }
+                    })
                     
                     try:
                         analysis = critical_analyst.analyze_critically(article, 'it')
@@ -185,8 +286,6 @@ def main():
                     console.print(f"\n[bold blue]🔍 Scraping URL...[/bold blue]")
                     
                     try:
-                        scraper = ArticleScraper()
-                        
                         if not scraper.validate_url(url):
                             console.print("[yellow]⚠️ URL non riconosciuto come articolo di notizia, ma proverò comunque...[/yellow]")
                         
@@ -219,6 +318,8 @@ def main():
         else:
             try:
                 idx = int(user_input)
+                if idx in displayed:
+                    idx = find_article(articles, displayed[idx], idx)
                 if 0 <= idx < len(articles):
                     selected_idx = idx
                     console.print(f"[green]✅ Articolo #{idx} selezionato[/green]")
@@ -0,0 +1,142 @@
+import json
+import re
+
+# Tipi schema.org che descrivono l'articolo principale della pagina
+ARTICLE_TYPES = {
+    'Article', 'NewsArticle', 'ReportageNewsArticle', 'AnalysisNewsArticle', 'OpinionNewsArticle',
+    'BlogPosting', 'ScholarlyArticle', 'MedicalScholarlyArticle', 'Report', 'TechArticle'
+}
+
+DOI_RE = re.compile(r'10\.\d{4,}/[-._;()/:\w]+')
+
+# Chiavi dei meta tag (name/property/itemprop, in minuscolo) per ciascun campo, in ordine di priorità
+META_FIELDS = {
+    'title': ('citation_title', 'dc.title', 'og:title', 'twitter:title'),
+    'date': ('citation_publication_date', 'citation_date', 'citation_online_date', 'article:published_time',
+             'dc.date', 'dc.date.issued', 'date', 'pubdate', 'publishdate', 'datepublished'),
+    'journal': ('citation_journal_title', 'citation_conference_title', 'prism.publicationname'),
+    'doi': ('citation_doi', 'prism.doi', 'dc.identifier', 'bepress_citation_doi'),
+    'abstract': ('citation_abstract', 'dc.description'),
+    'description': ('og:description', 'description', 'twitter:description'),
+    'site_name': ('og:site_name', 'application-name'),
+    'pdf_url': ('citation_pdf_url',)
+}
+AUTHOR_KEYS = ('citation_author', 'dc.creator', 'author', 'article:author', 'byl')
+
+def _names(value):
+    """Nomi di autori da un valore JSON-LD (stringa, oggetto o lista)"""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        name = value.get('name')
+        return [name] if isinstance(name, str) else []
+    if isinstance(value, list):
+        return [name for item in value for name in _names(item)]
+    return []
+
+def _json_ld_article(data):
+    """Primo oggetto JSON-LD di tipo articolo, cercando anche in liste e @graph"""
+    pending = [data]
+    while pending:
+        item = pending.pop(0)
+        if isinstance(item, list):
+            pending.extend(item)
+        elif isinstance(item, dict):
+            types = item.get('@type')
+            types = types if isinstance(types, list) else [types]
+            if any(t in ARTICLE_TYPES for t in types if isinstance(t, str)):
+                return item
+            if '@graph' in item:
+                pending.append(item['@graph'])
+    return None
+
+def _from_json_ld(article):
+    fields = {}
+    title = article.get('headline') or article.get('name')
+    if isinstance(title, str):
+        fields['title'] = title
+    if isinstance(article.get('datePublished'), str):
+        fields['date'] = article['datePublished']
+    authors = _names(article.get('author'))
+    if authors:
+        fields['authors'] = authors
+    part_of = article.get('isPartOf')
+    if isinstance(part_of, dict) and isinstance(part_of.get('name'), str):
+        fields['journal'] = part_of['name']
+    if isinstance(article.get('description'), str):
+        fields['description'] = article['description']
+    for key in ('identifier', 'sameAs', '@id', 'url'):
+        values = article.get(key)
+        for value in values if isinstance(values, list) else [values]:
+            if isinstance(value, dict):
+                value = value.get('value')
+            match = DOI_RE.search(value) if isinstance(value, str) else None
+            if match:
+                fields.setdefault('doi', match.group())
+    return fields
+
+def extract_metadata(soup):
+    """Legge in una sola passata i metadati strutturati nell'<head> della pagina.
+    
+    Considera i meta citation_* (Highwire, usati dalle riviste), JSON-LD schema.org,
+    OpenGraph e Dublin Core. Restituisce un dizionario con i soli campi trovati tra:
+    title, authors, date, journal, doi, abstract, description, site_name, pdf_url e
+    page_title (il testo di <title>, spesso con il nome del sito).
+    Priorità: citation_* e Dublin Core, poi JSON-LD, poi OpenGraph e meta generici.
+    """
+    head = soup.head
+    if head is None:
+        return {}
+    
+    meta = {}
+    authors = {}
+    json_ld = None
+    page_title = None
+    for tag in head.find_all(['meta', 'script', 'title']):
+        if tag.name == 'meta':
+            key = (tag.get('name') or tag.get('property') or tag.get('itemprop') or '').strip().lower()
+            content = (tag.get('content') or '').strip()
+            if not key or not content:
+                continue
+            if key in AUTHOR_KEYS:
+                authors.setdefault(key, []).append(content)
+            else:
+                meta.setdefault(key, content)
+        elif tag.name == 'script':
+            if json_ld is None and (tag.get('type') or '').lower() == 'application/ld+json':
+                try:
+                    json_ld = _json_ld_article(json.loads(tag.string or ''))
+                except ValueError:
+                    pass
+        elif page_title is None:
+            page_title = tag.get_text(strip=True)
+    
+    structured = _from_json_ld(json_ld) if json_ld else {}
+    fields = {}
+    for field, keys in META_FIELDS.items():
+        # Prima i meta specifici (citation_*, dc.*), poi JSON-LD, poi quelli generici
+        specific = [key for key in keys if key.startswith(('citation_', 'dc.', 'prism.', 'bepress_'))]
+        generic = [key for key in keys if key not in specific]
+        value = next((meta[key] for key in specific if key in meta), None)
+        value = value or structured.get(field) or next((meta[key] for key in generic if key in meta), None)
+        if value:
+            fields[field] = value
+    
+    if 'doi' in fields:
+        match = DOI_RE.search(fields['doi'])
+        if match:
+            fields['doi'] = match.group()
+        else:
+            del fields['doi']
+    
+    author_list = authors.get('citation_author') or authors.get('dc.creator') or structured.get('authors')
+    if not author_list:
+        # article:author è spesso l'URL della pagina autore: si tengono solo i nomi
+        author_list = [name for key in ('author', 'byl', 'article:author') for name in authors.get(key, [])
+                       if not name.startswith(('http://', 'https://'))]
+    if author_list:
+        fields['authors'] = list(dict.fromkeys(name.strip() for name in author_list if name.strip()))
+    
+    if page_title:
+        fields['page_title'] = page_title
+    return fields
@@ -0,0 +1,150 @@
+import sys
+from dataclasses import dataclass, field, fields, replace
+from typing import Callable, Optional, Tuple
+from urllib.parse import urlparse
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+def _domain_from_link(link):
+    try:
+        domain = urlparse(link).netloc.lower()
+    except ValueError:
+        return None
+    return domain[4:] if domain.startswith('www.') else domain
+
+@dataclass(slots=True)
+class Article:
+    """Record compatto di un articolo.
+    
+    Usa __slots__ e stringhe internate per i campi ripetuti (fonte, autore, dominio);
+    il corpo ('content') può essere caricato solo quando serve tramite content_loader.
+    Espone get()/[] come un dizionario: un campo a None equivale a una chiave assente.
+    """
+    
+    title: Optional[str] = None
+    link: Optional[str] = None
+    summary: Optional[str] = None
+    date: Optional[str] = None
+    author: Optional[str] = None
+    source: Optional[str] = None
+    parsed_date: Optional[str] = None
+    domain: Optional[str] = None
+    sources: Tuple[str, ...] = ()
+    source_count: int = 1
+    scraped: Optional[bool] = None
+    _content: Optional[str] = field(default=None, repr=False)
+    content_loader: Optional[Callable[[], Optional[str]]] = field(default=None, repr=False, compare=False)
+    extra: Optional[dict] = field(default=None, repr=False)
+    
+    def __post_init__(self):
+        self.source = _intern(self.source)
+        self.author = _intern(self.author)
+        if self.domain is None and self.link:
+            self.domain = _domain_from_link(self.link)
+        self.domain = _intern(self.domain)
+        self.sources = tuple(_intern(source) for source in self.sources)
+    
+    @property
+    def content(self):
+        """Corpo dell'articolo, caricato alla prima lettura se è disponibile un loader"""
+        if self._content is None and self.content_loader is not None:
+            self._content = self.content_loader()
+            self.content_loader = None
+        return self._content
+    
+    @content.setter
+    def content(self, value):
+        self._content = value
+        self.content_loader = None
+    
+    @classmethod
+    def from_dict(cls, data, content_loader=None):
+        """Crea un Article da un dizionario con le chiavi usate finora nel progetto"""
+        if isinstance(data, cls):
+            return data
+        
+        values = {}
+        extra = {}
+        for key, value in data.items():
+            if key == 'content':
+                values['_content'] = value
+            elif key in _FIELD_NAMES:
+                values[key] = value
+            else:
+                extra[key] = value
+        if 'sources' in values:
+            values['sources'] = tuple(values['sources'] or ())
+        if extra:
+            values['extra'] = extra
+        return cls(content_loader=content_loader, **values)
+    
+    def to_dict(self):
+        """Converte l'articolo in dizionario (carica il contenuto se necessario)"""
+        return {key: value for key, value in self.items()}
+    
+    def copy(self):
+        return replace(self, extra=dict(self.extra) if self.extra else None)
+    
+    def keys(self):
+        return [key for key, _ in self.items()]
+    
+    def items(self):
+        result = []
+        for name in _FIELD_NAMES:
+            value = getattr(self, name)
+            if value is not None:
+                result.append((name, list(value) if name == 'sources' else value))
+        content = self.content
+        if content is not None:
+            result.append(('content', content))
+        if self.extra:
+            result.extend(self.extra.items())
+        return result
+    
+    def get(self, key, default=None):
+        if key == 'content':
+            value = self.content
+        elif key in _FIELD_NAMES:
+            value = getattr(self, key)
+        elif self.extra:
+            value = self.extra.get(key)
+        else:
+            value = None
+        return default if value is None else value
+    
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+    
+    def __setitem__(self, key, value):
+        if key == 'content':
+            self.content = value
+        elif key in _FIELD_NAMES:
+            if key in ('source', 'author', 'domain'):
+                value = _intern(value)
+            elif key == 'sources':
+                value = tuple(_intern(source) for source in value)
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+    
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if key == 'content':
+            self.content = None
+        elif key in _FIELD_NAMES:
+            setattr(self, key, () if key == 'sources' else None)
+        else:
+            del self.extra[key]
+    
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+# Campi pubblici accessibili come chiavi (il contenuto è gestito a parte)
+_FIELD_NAMES = tuple(f.name for f in fields(Article) if not f.name.startswith('_') and f.name not in ('content_loader', 'extra'))
@@ -0,0 +1,205 @@
+import re
+import tempfile
+
+try:
+    from pypdf import PdfReader
+    from pypdf.errors import PyPdfError
+    PDF_SUPPORT = True
+except ImportError:
+    PdfReader = None
+    PyPdfError = Exception
+    PDF_SUPPORT = False
+
+from .content_extractor import truncate_text
+from .metadata import DOI_RE
+
+# Limiti per non far crescere memoria e tempo con PDF molto grandi
+MAX_PDF_BYTES = 25 * 1024 * 1024
+FIRST_PAGES = 3
+MAX_SECTION_PAGES = 6
+MAX_SCANNED_PAGES = 40
+CHUNK_SIZE = 64 * 1024
+
+# Titoli di sezione tipici di un articolo scientifico, anche numerati ("2.1 Methods")
+SECTION_HEADING_RE = re.compile(
+    r'^\s*(?:\d+(?:\.\d+)*\.?\s+|[IVX]+\.\s+)?'
+    r'(abstract|summary|introduction|background|materials?(?: and methods)?|methods?|methodology|experimental(?: section)?|'
+    r'results?(?: and discussion)?|findings|discussion|conclusions?|implications|references|bibliography|acknowledge?ments?)'
+    r'\s*:?\s*$',
+    re.I | re.M
+)
+WANTED_SECTIONS_RE = re.compile(r'method|material|experimental|result|finding|conclusion|discussion', re.I)
+BACK_MATTER_RE = re.compile(r'reference|bibliograph|acknowledg', re.I)
+
+def is_pdf_response(url, response):
+    """Indica se la risposta è un PDF, dal Content-Type o dall'estensione dell'URL"""
+    content_type = response.headers.get('Content-Type', '').lower()
+    return 'application/pdf' in content_type or url.lower().split('?')[0].endswith('.pdf')
+
+def download_pdf(response, max_bytes=MAX_PDF_BYTES):
+    """Scarica in streaming un PDF in un file temporaneo, senza tenerlo in memoria.
+    
+    Restituisce il file aperto (eliminato alla chiusura) oppure None se il documento
+    supera max_bytes: un PDF troncato non è leggibile, perché l'indice è in fondo.
+    """
+    length = response.headers.get('Content-Length')
+    if length and length.isdigit() and int(length) > max_bytes:
+        response.close()
+        return None
+    
+    pdf_file = tempfile.TemporaryFile()
+    size = 0
+    try:
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_bytes:
+                pdf_file.close()
+                return None
+            pdf_file.write(chunk)
+    finally:
+        response.close()
+    pdf_file.seek(0)
+    return pdf_file
+
+def _outline_pages(reader):
+    """Pagine di inizio delle sezioni cercate, dai segnalibri del PDF (se presenti)"""
+    pages = set()
+    pending = list(reader.outline or [])
+    while pending:
+        item = pending.pop()
+        if isinstance(item, list):
+            pending.extend(item)
+            continue
+        title = getattr(item, 'title', '') or ''
+        if WANTED_SECTIONS_RE.search(title):
+            try:
+                page_number = reader.get_destination_page_number(item)
+            except (PyPdfError, KeyError, ValueError, AttributeError):
+                continue
+            if page_number is not None and page_number >= 0:
+                pages.update((page_number, page_number + 1))
+    return pages
+
+def _page_text(reader, number):
+    try:
+        return reader.pages[number].extract_text() or ''
+    except (PyPdfError, KeyError, ValueError, TypeError):
+        return ''
+
+def split_sections(text):
+    """Divide il testo in sezioni: lista di (titolo in minuscolo, testo)"""
+    sections = []
+    matches = list(SECTION_HEADING_RE.finditer(text))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        body = ' '.join(text[match.end():end].split())
+        if body:
+            sections.append((match.group(1).lower(), body))
+    return sections
+
+def read_pdf_pages(pdf_file, first_pages=FIRST_PAGES, max_section_pages=MAX_SECTION_PAGES,
+                   max_scanned_pages=MAX_SCANNED_PAGES):
+    """Testo delle prime pagine e delle pagine con metodi, risultati e conclusioni.
+    
+    Le pagine delle sezioni si trovano dai segnalibri del PDF; se mancano, si scorrono
+    le pagine successive (al massimo max_scanned_pages) tenendo solo quelle con un titolo
+    di sezione cercato. Restituisce (metadati del documento, lista di (pagina, testo)).
+    """
+    reader = PdfReader(pdf_file)
+    page_count = len(reader.pages)
+    pages = {number: _page_text(reader, number) for number in range(min(first_pages, page_count))}
+    
+    try:
+        outline_pages = _outline_pages(reader)
+    except (PyPdfError, KeyError, ValueError):
+        outline_pages = set()
+    
+    if outline_pages:
+        for number in sorted(outline_pages - set(pages))[:max_section_pages]:
+            if number < page_count:
+                pages[number] = _page_text(reader, number)
+    else:
+        selected = 0
+        for number in range(len(pages), min(page_count, max_scanned_pages)):
+            if selected >= max_section_pages:
+                break
+            text = _page_text(reader, number)
+            headings = [match.group(1) for match in SECTION_HEADING_RE.finditer(text)]
+            if any(WANTED_SECTIONS_RE.search(heading) for heading in headings):
+                pages[number] = text
+                selected += 1
+    
+    info = {}
+    try:
+        metadata = reader.metadata or {}
+        info = {'title': metadata.get('/Title'), 'author': metadata.get('/Author'),
+                'subject': metadata.get('/Subject'), 'date': metadata.get('/CreationDate')}
+    except (PyPdfError, KeyError, ValueError):
+        pass
+    return {key: str(value).strip() for key, value in info.items() if value}, sorted(pages.items())
+
+def _pdf_date(value):
+    """Data dal formato PDF (D:20240115103000+01'00') a AAAA-MM-GG"""
+    match = re.match(r"D:(\d{4})(\d{2})?(\d{2})?", value or '')
+    if not match:
+        return None
+    return '-'.join(part for part in match.groups() if part)
+
+def _first_section(sections, keywords):
+    for keyword in keywords:
+        for heading, body in sections:
+            if re.search(keyword, heading, re.I):
+                return body
+    return None
+
+def extract_pdf_study(url, pdf_file, section_keywords, peer_reviewed_indicators, budget=None):
+    """Compila gli stessi campi di study_info dell'estrazione HTML leggendo solo le pagine utili.
+    
+    Con budget il testo completo resta entro budget caratteri (prima abstract, metodi,
+    risultati e conclusioni) e ogni sezione entro un quarto del budget.
+    """
+    info, pages = read_pdf_pages(pdf_file)
+    text = '\n'.join(page_text for _, page_text in pages)
+    sections = split_sections(text)
+    first_page = pages[0][1] if pages else ''
+    
+    title = info.get('title')
+    if not title or len(title) < 10:
+        lines = [line.strip() for line in first_page.splitlines() if len(line.strip()) > 15]
+        title = lines[0] if lines else None
+    
+    # "Rossi, Mario; Bianchi, Luca" oppure "Mario Rossi, Luca Bianchi and Anna Verdi"
+    author_field = info.get('author', '')
+    separator = r';| and ' if ';' in author_field else r',| and '
+    authors = [name.strip() for name in re.split(separator, author_field) if name.strip()]
+    doi_match = DOI_RE.search(first_page) or DOI_RE.search(text)
+    abstract = _first_section(sections, ('abstract', 'summary')) or info.get('subject')
+    text_lower = text.lower()
+    section_limit = budget // 4 if budget else None
+    fields = {
+        field: truncate_text(_first_section(sections, section_keywords[field]) or '', section_limit)
+        for field in ('methodology', 'results', 'conclusions')
+    }
+    
+    # Testo completo: prima le sezioni estratte, poi il resto senza bibliografia e ringraziamenti
+    priority = [part for part in (abstract, fields['methodology'], fields['results'], fields['conclusions']) if part]
+    others = [body for heading, body in sections
+              if not BACK_MATTER_RE.search(heading) and not any(body.startswith(part[:200]) for part in priority)]
+    full_text = ' '.join(truncate_text(part, section_limit) for part in priority + others) or ' '.join(text.split())
+    
+    return {
+        'url': url,
+        'title': title or "Titolo non trovato",
+        'authors': authors or ["Autori non trovati"],
+        'abstract': truncate_text(abstract, section_limit) if abstract else "Abstract non trovato",
+        'methodology': fields['methodology'] or "Metodologia non trovata",
+        'results': fields['results'] or "Risultati non trovati",
+        'conclusions': fields['conclusions'] or "Conclusioni non trovate",
+        'publication_date': _pdf_date(info.get('date')) or "Data non trovata",
+        'journal': "Rivista non trovata",
+        'doi': doi_match.group().rstrip('.,;') if doi_match else "DOI non trovato",
+        'peer_reviewed': any(indicator in text_lower for indicator in peer_reviewed_indicators),
+        'full_text': truncate_text(full_text, budget),
+        'pdf_url': url,
+        'pages_read': [number + 1 for number, _ in pages]
+    }
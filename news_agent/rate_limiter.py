@@ -0,0 +1,115 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+DEFAULT_RATE = 0.5
+DEFAULT_BURST = 2
+
+class TokenBucket:
+    """Secchiello di token: 'rate' richieste al secondo con raffiche fino a 'capacity'"""
+    
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self):
+        """Prenota un token e restituisce quanti secondi attendere prima di usarlo"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            # Con token negativi la richiesta è in coda: attende che il saldo torni a zero
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+    
+    def refund(self):
+        """Restituisce un token prenotato ma non usato"""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+class DomainRateLimiter:
+    """Limita la frequenza delle richieste per dominio, condiviso da tutto il processo.
+    
+    Ogni dominio ha il proprio secchiello: una richiesta attende solo se supera il
+    ritmo consentito verso lo stesso host, mai per richieste ad altri domini.
+    """
+    
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+    
+    def _bucket(self, domain):
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is None:
+                bucket = self._buckets[domain] = TokenBucket(self.rate, self.burst)
+            return bucket
+    
+    def acquire(self, url, cancel_event=None):
+        """Attende, se serve, il turno per una richiesta a url; restituisce i secondi attesi.
+        
+        Con cancel_event l'attesa si interrompe appena l'evento è impostato: in quel caso
+        il token prenotato viene restituito e il risultato è None (la richiesta non va fatta).
+        """
+        if cancel_event is not None and cancel_event.is_set():
+            return None
+        domain = urlparse(url).netloc.lower()
+        if domain.startswith('www.'):
+            domain = domain[4:]
+        bucket = self._bucket(domain)
+        wait = bucket.reserve()
+        if cancel_event is None:
+            if wait > 0:
+                time.sleep(wait)
+            return wait
+        cancelled = cancel_event.wait(wait) if wait > 0 else cancel_event.is_set()
+        if cancelled:
+            bucket.refund()
+            return None
+        return wait
+
+class HostLimiter:
+    """Limita le richieste simultanee verso lo stesso host, con un semaforo per host"""
+    
+    def __init__(self, per_host_limit):
+        self.per_host_limit = per_host_limit
+        self._semaphores = {}
+        self._lock = threading.Lock()
+    
+    def run(self, url, function, *args, **kwargs):
+        """Esegue function(*args, **kwargs) quando c'è un posto libero per l'host di url"""
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._semaphores[host] = threading.Semaphore(self.per_host_limit)
+        with semaphore:
+            return function(*args, **kwargs)
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter():
+    """Restituisce il limitatore per dominio condiviso dal processo"""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = DomainRateLimiter()
+        return _rate_limiter
+
+def configure_rate_limiter(settings):
+    """Ricrea il limitatore con i parametri della sezione [Network] delle impostazioni"""
+    global _rate_limiter
+    try:
+        rate = float(settings.get('scrape_rate_per_domain', DEFAULT_RATE))
+        burst = float(settings.get('scrape_burst', DEFAULT_BURST))
+    except (TypeError, ValueError):
+        rate, burst = DEFAULT_RATE, DEFAULT_BURST
+    with _rate_limiter_lock:
+        _rate_limiter = DomainRateLimiter(max(rate, 0.01), max(burst, 1))
+        return _rate_limiter
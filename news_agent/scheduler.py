@@ -0,0 +1,196 @@
+import random
+import threading
+import time
+
+from .dedup import StoryIndex
+from .feed_health import CircuitOpenError, get_feed_health
+from .fetcher import fetch_feed, parse_datetime, DEFAULT_SOURCES
+
+def _published_timestamp(article):
+    """Istante di pubblicazione dell'articolo in secondi epoch, se ricavabile"""
+    parsed = parse_datetime(article.get('date', ''), article.get('source'))
+    return parsed.timestamp() if parsed else None
+
+class FeedState:
+    """Stato di polling di un singolo feed"""
+    
+    def __init__(self, url, initial_interval):
+        self.url = url
+        self.interval = initial_interval
+        self.next_poll = 0.0
+        self.ewma_gap = None
+        self.last_item_ts = None
+        self.failures = 0
+        self.polls = 0
+        self.new_items = 0
+        self.last_error = None
+
+class FeedScheduler(threading.Thread):
+    """Daemon che aggiorna i feed in background con intervalli adattivi.
+    
+    L'intervallo di ogni feed segue la media mobile esponenziale (EWMA) degli
+    intervalli tra gli articoli pubblicati, con jitter casuale e backoff
+    esponenziale in caso di errori. Le storie nuove vengono passate a
+    on_new_articles; gli articoli che riprendono una storia già nota, anche di
+    un poll precedente, ne aggiornano le fonti tramite on_story_updates.
+    """
+    
+    def __init__(self, on_new_articles, sources=None, max_articles_per_source=15,
+                 min_interval=60, max_interval=1800, alpha=0.3, jitter=0.1, initial_delay=None,
+                 on_story_updates=None):
+        super().__init__(name="FeedScheduler", daemon=True)
+        self.on_new_articles = on_new_articles
+        self.on_story_updates = on_story_updates
+        self.max_articles_per_source = max_articles_per_source
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.alpha = alpha
+        self.jitter = jitter
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._stories = StoryIndex()
+        self._seed = None
+        self._pending_updates = 0
+        
+        delay = min_interval if initial_delay is None else initial_delay
+        now = time.time()
+        self.states = {}
+        for i, url in enumerate(sources or DEFAULT_SOURCES):
+            state = FeedState(url, min_interval)
+            # Sfalsa i primi poll per non interrogare tutti i feed nello stesso istante
+            state.next_poll = now + delay + i * random.uniform(0.5, 2.0)
+            self.states[url] = state
+    
+    def seed(self, articles):
+        """Registra come storie già note gli articoli caricati all'avvio (indicizzati all'avvio del thread)"""
+        self._seed = articles
+    
+    def _index_seed(self):
+        articles, self._seed = self._seed, None
+        # Dal più vecchio: l'indice confronta per prime le storie inserite per ultime
+        for article in reversed(articles or ()):
+            self._stories.add(article)
+    
+    def stop(self):
+        self._stop_event.set()
+    
+    def consume_updates(self):
+        """Restituisce il numero di articoli arrivati dall'ultima chiamata e azzera il contatore"""
+        with self._lock:
+            count = self._pending_updates
+            self._pending_updates = 0
+        return count
+    
+    def run(self):
+        self._index_seed()
+        while not self._stop_event.is_set():
+            state = min(self.states.values(), key=lambda s: s.next_poll)
+            wait = state.next_poll - time.time()
+            if wait > 0 and self._stop_event.wait(wait):
+                break
+            self.poll(state)
+    
+    def poll(self, state):
+        """Interroga un feed, consegna gli articoli nuovi e ricalcola l'intervallo"""
+        state.polls += 1
+        try:
+            articles = fetch_feed(state.url, max_items=self.max_articles_per_source)
+        except CircuitOpenError:
+            # Il circuit breaker decide quando riprovare: il poll successivo coincide con la prova
+            state.last_error = "sospeso dal circuit breaker"
+            state.next_poll = time.time() + max(self.min_interval, get_feed_health().retry_in(state.url))
+            return
+        except Exception as e:
+            state.failures += 1
+            state.last_error = str(e)
+            backoff = min(self.max_interval, state.interval * (2 ** state.failures))
+            state.next_poll = time.time() + self._with_jitter(backoff)
+            return
+        
+        state.failures = 0
+        state.last_error = None
+        
+        new_articles, updated = self._fold(articles)
+        
+        self._update_rate(state, articles)
+        state.next_poll = time.time() + self._with_jitter(state.interval)
+        
+        updates = [self._stories.story(story_id) for story_id in updated] if self.on_story_updates else []
+        if new_articles or updates:
+            state.new_items += len(new_articles)
+            try:
+                if new_articles:
+                    self.on_new_articles(new_articles)
+                if updates:
+                    self.on_story_updates(updates)
+            except Exception as e:
+                state.last_error = f"Consegna articoli fallita: {e}"
+                return
+            with self._lock:
+                self._pending_updates += len(new_articles) + len(updates)
+    
+    def _fold(self, articles):
+        """Unisce gli articoli del poll alle storie note: (rappresentanti delle storie nuove, id delle storie aggiornate)"""
+        new_stories = {}
+        updated = []
+        for article in articles:
+            if not article.get('link'):
+                continue
+            story_id, created, changed = self._stories.add(article)
+            if created:
+                new_stories[story_id] = article
+            elif changed and story_id not in new_stories and story_id not in updated:
+                updated.append(story_id)
+        
+        new_articles = []
+        for story_id, article in new_stories.items():
+            representative = article.copy()
+            for key, value in self._stories.story(story_id).items():
+                representative[key] = value
+            new_articles.append(representative)
+        return new_articles, updated
+    
+    def _update_rate(self, state, articles):
+        """Aggiorna l'EWMA dei gap tra pubblicazioni e l'intervallo di polling"""
+        timestamps = sorted(ts for ts in (_published_timestamp(a) for a in articles) if ts)
+        if state.last_item_ts is not None:
+            timestamps = [ts for ts in timestamps if ts > state.last_item_ts]
+            previous = state.last_item_ts
+        else:
+            previous = timestamps[0] if timestamps else None
+            timestamps = timestamps[1:]
+        
+        for ts in timestamps:
+            gap = max(ts - previous, 1.0)
+            state.ewma_gap = gap if state.ewma_gap is None else self.alpha * gap + (1 - self.alpha) * state.ewma_gap
+            previous = ts
+        
+        if previous is not None:
+            state.last_item_ts = previous
+            if not timestamps and state.ewma_gap is not None:
+                # Nessuna novità: il silenzio in corso conta come un gap ancora aperto
+                silence = time.time() - previous
+                if silence > state.ewma_gap:
+                    state.ewma_gap = self.alpha * silence + (1 - self.alpha) * state.ewma_gap
+        
+        if state.ewma_gap is not None:
+            # Interroga circa due volte per ogni nuovo articolo atteso
+            state.interval = min(self.max_interval, max(self.min_interval, state.ewma_gap / 2))
+    
+    def _with_jitter(self, interval):
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+    
+    def stats(self):
+        """Stato di polling di ogni feed, per diagnostica"""
+        return {
+            url: {
+                'interval': round(state.interval),
+                'ewma_gap': round(state.ewma_gap) if state.ewma_gap else None,
+                'polls': state.polls,
+                'new_items': state.new_items,
+                'failures': state.failures,
+                'last_error': state.last_error,
+                'next_poll_in': max(0, round(state.next_poll - time.time()))
+            }
+            for url, state in self.states.items()
+        }
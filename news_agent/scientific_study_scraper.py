@@ -1,24 +1,73 @@
 
-import requests
+import threading
 import time
 import random
-from urllib.parse import urlparse, quote
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urljoin, urlparse, quote
 from bs4 import BeautifulSoup
 import re
 import json
 
+from .content_cache import get_content_cache
+from .content_extractor import get_content_budget
+from .dedup import canonicalize_url
+from .html_parser import parse_html
+from .http_client import get_http_client
+from .metadata import DOI_RE, extract_metadata
+from .pdf_extractor import MAX_PDF_BYTES, PDF_SUPPORT, PyPdfError, download_pdf, extract_pdf_study, is_pdf_response
+from .rate_limiter import get_rate_limiter
+from .section_index import SectionIndex
+
+TITLE_SELECTORS = ('h1.title', '.publication-title', '.article-title', 'h1', '.title', '[data-testid="title"]')
+AUTHOR_SELECTORS = ('.authors', '.author-list', '.contrib-author', '[data-testid="authors"]', '.author')
+ABSTRACT_SELECTORS = ('.abstract', '.summary', '[data-testid="abstract"]', '.article-abstract', '.abstract-text')
+DATE_SELECTORS = ('.publication-date', '.date', '.published-date', '[data-testid="date"]', 'time')
+JOURNAL_SELECTORS = ('.journal-name', '.publication-title', '.journal', '[data-testid="journal"]')
+DOI_SELECTORS = ('.doi', '[data-testid="doi"]', '.identifier')
+
+# Parole chiave dei titoli di sezione, in ordine di priorità
+METHODOLOGY_KEYWORDS = ('method', 'methodology', 'methods', 'materials', 'procedures')
+RESULTS_KEYWORDS = ('results', 'findings', 'outcomes', 'data')
+CONCLUSION_KEYWORDS = ('conclusion', 'discussion', 'summary', 'implications')
+
+PEER_REVIEWED_INDICATORS = ('peer-reviewed', 'peer review', 'refereed', 'academic journal', 'scientific journal')
+ABSTRACT_KEYWORDS = ('abstract', 'summary')
+BACK_MATTER_KEYWORDS = ('reference', 'bibliograph', 'acknowledg', 'funding', 'conflict of interest')
+
+# Sezioni più informative, in ordine, per il testo dello studio
+PRIORITY_SECTIONS = (ABSTRACT_KEYWORDS, METHODOLOGY_KEYWORDS, RESULTS_KEYWORDS, CONCLUSION_KEYWORDS)
+
+SECTION_KEYWORDS = {
+    'methodology': METHODOLOGY_KEYWORDS,
+    'results': RESULTS_KEYWORDS,
+    'conclusions': CONCLUSION_KEYWORDS
+}
+
+# Valori restituiti dagli estrattori quando una sezione manca
+MISSING_SECTIONS = {
+    'abstract': "Abstract non trovato",
+    'methodology': "Metodologia non trovata",
+    'results': "Risultati non trovati",
+    'conclusions': "Conclusioni non trovate"
+}
+
+# Ricerca dello studio: timeout di ogni richiesta e scadenza complessiva (secondi)
+SEARCH_TIMEOUT = 8
+DISCOVERY_DEADLINE = 15
+
 class ScientificStudyScraper:
     """Scraper specializzato per studi scientifici e paper"""
     
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+        # Connessioni condivise con il resto dell'applicazione, header propri dello scraper
+        self.http = get_http_client()
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
             'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
-        })
+        }
         
         self.scientific_journals = {
             'archaeometry': 'https://onlinelibrary.wiley.com/journal/14754754',
@@ -38,276 +87,313 @@ class ScientificStudyScraper:
     
     def find_study_urls(self, study_name, author_name=None):
         """Trova URL di studi scientifici basati su nome e autore"""
-        urls = []
-        
-        scholar_query = f'"{study_name}"'
+        return self.discover_study_urls([study_name], author_name=author_name, study_name=study_name)
+    
+    def _search_scholar(self, term, author_name=None, timeout=SEARCH_TIMEOUT, cancel_event=None):
+        """Risultati di Google Scholar per un termine di ricerca (nessuna richiesta se cancel_event è impostato)"""
+        scholar_query = f'"{term}"'
         if author_name:
             scholar_query += f' "{author_name}"'
         
-        try:
-            scholar_url = f"https://scholar.google.com/scholar?q={quote(scholar_query)}"
-            response = self.session.get(scholar_url)
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                for result in soup.find_all('div', class_='gs_r gs_or gs_scl'):
-                    title_elem = result.find('h3', class_='gs_rt')
-                    if title_elem:
-                        link = title_elem.find('a')
-                        if link and link.get('href'):
-                            urls.append({
-                                'url': link['href'],
-                                'title': title_elem.get_text(),
-                                'source': 'Google Scholar'
-                            })
-        except Exception as e:
-            print(f"❌ Errore ricerca Google Scholar: {e}")
+        scholar_url = f"https://scholar.google.com/scholar?q={quote(scholar_query)}"
+        if get_rate_limiter().acquire(scholar_url, cancel_event) is None:
+            return []
+        response = self.http.get(scholar_url, headers=self.headers, timeout=timeout)
+        if response.status_code != 200:
+            return []
         
-        try:
-            rg_query = f'"{study_name}"'
-            rg_url = f"https://www.researchgate.net/search/publication?q={quote(rg_query)}"
-            response = self.session.get(rg_url)
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                for result in soup.find_all('div', class_='nova-legacy-v-publication-item'):
-                    title_elem = result.find('a', class_='nova-legacy-v-publication-item__title')
-                    if title_elem:
-                        urls.append({
-                            'url': f"https://www.researchgate.net{title_elem['href']}",
-                            'title': title_elem.get_text(),
-                            'source': 'ResearchGate'
-                        })
-        except Exception as e:
-            print(f"❌ Errore ricerca ResearchGate: {e}")
+        urls = []
+        soup = parse_html(response.content)
+        for result in soup.find_all('div', class_='gs_r gs_or gs_scl'):
+            title_elem = result.find('h3', class_='gs_rt')
+            if title_elem:
+                link = title_elem.find('a')
+                if link and link.get('href'):
+                    byline = result.find('div', class_='gs_a')
+                    urls.append({
+                        'url': link['href'],
+                        'title': title_elem.get_text(),
+                        'source': 'Google Scholar',
+                        'byline': byline.get_text() if byline else ''
+                    })
+        return urls
+    
+    def _search_researchgate(self, term, author_name=None, timeout=SEARCH_TIMEOUT, cancel_event=None):
+        """Risultati di ResearchGate per un termine di ricerca (nessuna richiesta se cancel_event è impostato)"""
+        rg_query = f'"{term}"'
+        rg_url = f"https://www.researchgate.net/search/publication?q={quote(rg_query)}"
+        if get_rate_limiter().acquire(rg_url, cancel_event) is None:
+            return []
+        response = self.http.get(rg_url, headers=self.headers, timeout=timeout)
+        if response.status_code != 200:
+            return []
         
-        return urls[:5]  # Massimo 5 risultati
+        urls = []
+        soup = parse_html(response.content)
+        for result in soup.find_all('div', class_='nova-legacy-v-publication-item'):
+            title_elem = result.find('a', class_='nova-legacy-v-publication-item__title')
+            if title_elem and title_elem.get('href'):
+                urls.append({
+                    'url': f"https://www.researchgate.net{title_elem['href']}",
+                    'title': title_elem.get_text(),
+                    'source': 'ResearchGate',
+                    'byline': ''
+                })
+        return urls
+    
+    def discover_study_urls(self, search_terms, author_name=None, study_name=None, journal=None,
+                            deadline=DISCOVERY_DEADLINE, enough=5, max_workers=6):
+        """Cerca lo studio con tutte le varianti dei termini su tutti i motori in parallelo.
+        
+        Le ricerche (termine × motore) partono insieme, le più specifiche per prime, e
+        sono vincolate da un'unica scadenza: appena si raccolgono 'enough' candidati
+        distinti le ricerche rimaste vengono annullate, anche quelle già in attesa del
+        limitatore per dominio, che non inviano la richiesta. I candidati sono ordinati per
+        pertinenza (vedi _rank_candidate) e restituiti al massimo in 'enough'.
+        """
+        search_terms = [term for term in dict.fromkeys(search_terms) if term and term.strip()]
+        if not search_terms:
+            return []
+        
+        backends = (('Google Scholar', self._search_scholar), ('ResearchGate', self._search_researchgate))
+        started = time.monotonic()
+        candidates = {}
+        cancelled = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(search_terms) * len(backends)))
+        pending = {
+            executor.submit(search, term, author_name, cancel_event=cancelled): (rank, name, term)
+            for rank, term in enumerate(search_terms)
+            for name, search in backends
+        }
+        try:
+            while pending and len(candidates) < enough:
+                remaining = deadline - (time.monotonic() - started)
+                if remaining <= 0:
+                    print(f"⏱️ Ricerca dello studio interrotta dopo {deadline}s con {len(candidates)} candidati")
+                    break
+                done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    rank, name, term = pending.pop(future)
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        print(f"❌ Errore ricerca {name} ({term}): {e}")
+                        continue
+                    for result in results:
+                        key = canonicalize_url(result['url'])
+                        candidate = candidates.setdefault(key, dict(result, term_rank=rank, hits=0))
+                        candidate['hits'] += 1
+                        candidate['term_rank'] = min(candidate['term_rank'], rank)
+        finally:
+            cancelled.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        ranked = sorted(candidates.values(),
+                        key=lambda candidate: self._rank_candidate(candidate, study_name, author_name, journal),
+                        reverse=True)
+        return ranked[:enough]
+    
+    def _rank_candidate(self, candidate, study_name=None, author_name=None, journal=None):
+        """Punteggio di pertinenza di un risultato di ricerca rispetto allo studio cercato"""
+        title = candidate.get('title', '').lower()
+        byline = candidate.get('byline', '').lower()
+        score = 0.0
+        
+        if study_name:
+            words = set(re.findall(r'\w{4,}', study_name.lower()))
+            if words:
+                score += 4 * len(words & set(re.findall(r'\w{4,}', title))) / len(words)
+        parts = author_name.split() if author_name else []
+        if parts:
+            surname = parts[-1].lower()
+            if surname in byline or surname in title:
+                score += 2
+        if journal and journal.lower() in byline:
+            score += 1
+        
+        domain = urlparse(candidate['url']).netloc.lower()
+        if any(urlparse(site).netloc.replace('www.', '') in domain for site in self.scientific_journals.values()):
+            score += 1
+        if candidate.get('source') == 'Google Scholar':
+            score += 0.5
+        # Trovato da più ricerche, o da termini più specifici: più probabilmente è lo studio giusto
+        score += 0.5 * (candidate.get('hits', 1) - 1)
+        score -= 0.1 * candidate.get('term_rank', 0)
+        return score
     
     def scrape_study_content(self, url):
         """Scrapa il contenuto di uno studio scientifico"""
         try:
             print(f"🔬 Scraping studio: {url}")
             
-            response = self.session.get(url, timeout=30)
+            cache = get_content_cache()
+            cached = cache.get('study', url) if cache else None
+            if cached:
+                print("⚡ Studio già analizzato di recente, uso la cache")
+                return cached
+            
+            get_rate_limiter().acquire(url)
+            response = self.http.get(url, headers=self.headers, timeout=30, stream=True)
             if response.status_code != 200:
+                response.close()
                 return None
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            study_info = {
-                'url': url,
-                'title': self._extract_title(soup),
-                'authors': self._extract_authors(soup),
-                'abstract': self._extract_abstract(soup),
-                'methodology': self._extract_methodology(soup),
-                'results': self._extract_results(soup),
-                'conclusions': self._extract_conclusions(soup),
-                'publication_date': self._extract_date(soup),
-                'journal': self._extract_journal(soup),
-                'doi': self._extract_doi(soup),
-                'peer_reviewed': self._is_peer_reviewed(soup),
-                'full_text': self._extract_full_text(soup)
-            }
+            if is_pdf_response(url, response):
+                study_info = self._scrape_pdf(url, response)
+                if not study_info:
+                    return None
+            else:
+                html, _ = self.http.read_body(response)
+                study_info = self._parse_study_html(url, html)
             
+            if cache:
+                cache.put('study', url, study_info)
             return study_info
             
         except Exception as e:
             print(f"❌ Errore scraping studio {url}: {e}")
             return None
     
-    def _extract_title(self, soup):
-        """Estrae il titolo dello studio"""
-        selectors = [
-            'h1.title',
-            '.publication-title',
-            '.article-title',
-            'h1',
-            '.title',
-            '[data-testid="title"]'
-        ]
-        
-        for selector in selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                return elem.get_text().strip()
-        return "Titolo non trovato"
+    def _parse_study_html(self, url, html):
+        """Campi dello studio da una pagina HTML"""
+        soup = parse_html(html)
+        index = self._build_index(soup)
+        
+        # Le riviste pubblicano quasi sempre i meta citation_*: le euristiche servono solo per i campi mancanti
+        metadata = extract_metadata(soup)
+        study_info = {
+            'url': url,
+            'title': metadata.get('title') or self._extract_title(index),
+            'authors': metadata.get('authors') or self._extract_authors(index),
+            'abstract': metadata.get('abstract') or self._extract_abstract(index),
+            'methodology': self._extract_methodology(index),
+            'results': self._extract_results(index),
+            'conclusions': self._extract_conclusions(index),
+            'publication_date': metadata.get('date') or self._extract_date(index),
+            'journal': metadata.get('journal') or self._extract_journal(index),
+            'doi': metadata.get('doi') or self._extract_doi(index),
+            'peer_reviewed': self._is_peer_reviewed(index),
+            'pdf_url': metadata.get('pdf_url')
+        }
+        study_info['full_text'] = self._extract_full_text(index, study_info['abstract'])
+        
+        # Pagina con solo l'abstract: metodi e risultati si leggono dal PDF indicato nei metadati
+        missing = [field for field, placeholder in MISSING_SECTIONS.items() if study_info[field] == placeholder]
+        if missing and study_info['pdf_url'] and PDF_SUPPORT:
+            pdf_url = urljoin(url, study_info['pdf_url'])
+            try:
+                get_rate_limiter().acquire(pdf_url)
+                response = self.http.get(pdf_url, headers=self.headers, timeout=30, stream=True)
+                if response.status_code == 200:
+                    pdf_info = self._scrape_pdf(pdf_url, response)
+                else:
+                    response.close()
+                    pdf_info = None
+            except Exception as e:
+                print(f"⚠️ PDF dello studio non disponibile: {e}")
+                pdf_info = None
+            if pdf_info:
+                for field in missing:
+                    if pdf_info[field] != MISSING_SECTIONS[field]:
+                        study_info[field] = pdf_info[field]
+                if len(pdf_info['full_text']) > len(study_info['full_text']):
+                    study_info['full_text'] = pdf_info['full_text']
+        return study_info
     
-    def _extract_authors(self, soup):
-        """Estrae gli autori"""
-        selectors = [
-            '.authors',
-            '.author-list',
-            '.contrib-author',
-            '[data-testid="authors"]',
-            '.author'
-        ]
+    def _scrape_pdf(self, url, response):
+        """Campi dello studio da un PDF, leggendo solo le prime pagine e quelle delle sezioni utili"""
+        if not PDF_SUPPORT:
+            response.close()
+            print("⚠️ Lo studio è un PDF: installa pypdf (pip install -e \".[pdf]\") per leggerlo")
+            return None
         
-        authors = []
-        for selector in selectors:
-            elems = soup.select(selector)
-            for elem in elems:
-                authors.append(elem.get_text().strip())
+        pdf_file = download_pdf(response)
+        if pdf_file is None:
+            print(f"⚠️ PDF troppo grande, oltre {MAX_PDF_BYTES // (1024 * 1024)} MB: {url}")
+            return None
         
+        with pdf_file:
+            try:
+                study_info = extract_pdf_study(url, pdf_file, SECTION_KEYWORDS, PEER_REVIEWED_INDICATORS,
+                                               budget=get_content_budget())
+            except (PyPdfError, ValueError, KeyError) as e:
+                print(f"❌ PDF non leggibile {url}: {e}")
+                return None
+        print(f"📄 PDF letto: pagine {', '.join(map(str, study_info['pages_read']))}")
+        return study_info
+    
+    def _build_index(self, soup):
+        """Indice delle sezioni e degli elementi usati dagli estrattori, in una sola visita"""
+        watch = (TITLE_SELECTORS + AUTHOR_SELECTORS + ABSTRACT_SELECTORS + DATE_SELECTORS
+                 + JOURNAL_SELECTORS + DOI_SELECTORS)
+        return SectionIndex(soup, watch=watch)
+    
+    def _first_text(self, index, selectors):
+        elem = index.first(selectors)
+        return elem.get_text().strip() if elem is not None else None
+    
+    def _extract_title(self, index):
+        """Estrae il titolo dello studio"""
+        return self._first_text(index, TITLE_SELECTORS) or "Titolo non trovato"
+    
+    def _extract_authors(self, index):
+        """Estrae gli autori"""
+        authors = [elem.get_text().strip() for elem in index.all(AUTHOR_SELECTORS)]
         return authors if authors else ["Autori non trovati"]
     
-    def _extract_abstract(self, soup):
+    def _extract_abstract(self, index):
         """Estrae l'abstract"""
-        selectors = [
-            '.abstract',
-            '.summary',
-            '[data-testid="abstract"]',
-            '.article-abstract',
-            '.abstract-text'
-        ]
-        
-        for selector in selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                return elem.get_text().strip()
-        return "Abstract non trovato"
+        return self._first_text(index, ABSTRACT_SELECTORS) or "Abstract non trovato"
     
-    def _extract_methodology(self, soup):
+    def _extract_methodology(self, index):
         """Estrae la metodologia"""
-        methodology_keywords = ['method', 'methodology', 'methods', 'materials', 'procedures']
-        
-        for keyword in methodology_keywords:
-            headings = soup.find_all(['h1', 'h2', 'h3', 'h4'], string=re.compile(keyword, re.I))
-            for heading in headings:
-                content = []
-                for sibling in heading.find_next_siblings():
-                    if sibling.name in ['h1', 'h2', 'h3', 'h4']:
-                        break
-                    if sibling.get_text().strip():
-                        content.append(sibling.get_text().strip())
-                
-                if content:
-                    return ' '.join(content[:500])  # Primi 500 caratteri
-        
-        return "Metodologia non trovata"
+        return index.section(METHODOLOGY_KEYWORDS, limit=self._section_budget()) or "Metodologia non trovata"
     
-    def _extract_results(self, soup):
+    def _extract_results(self, index):
         """Estrae i risultati"""
-        results_keywords = ['results', 'findings', 'outcomes', 'data']
-        
-        for keyword in results_keywords:
-            headings = soup.find_all(['h1', 'h2', 'h3', 'h4'], string=re.compile(keyword, re.I))
-            for heading in headings:
-                content = []
-                for sibling in heading.find_next_siblings():
-                    if sibling.name in ['h1', 'h2', 'h3', 'h4']:
-                        break
-                    if sibling.get_text().strip():
-                        content.append(sibling.get_text().strip())
-                
-                if content:
-                    return ' '.join(content[:500])
-        
-        return "Risultati non trovati"
+        return index.section(RESULTS_KEYWORDS, limit=self._section_budget()) or "Risultati non trovati"
     
-    def _extract_conclusions(self, soup):
+    def _extract_conclusions(self, index):
         """Estrae le conclusioni"""
-        conclusion_keywords = ['conclusion', 'discussion', 'summary', 'implications']
-        
-        for keyword in conclusion_keywords:
-            headings = soup.find_all(['h1', 'h2', 'h3', 'h4'], string=re.compile(keyword, re.I))
-            for heading in headings:
-                content = []
-                for sibling in heading.find_next_siblings():
-                    if sibling.name in ['h1', 'h2', 'h3', 'h4']:
-                        break
-                    if sibling.get_text().strip():
-                        content.append(sibling.get_text().strip())
-                
-                if content:
-                    return ' '.join(content[:500])
-        
-        return "Conclusioni non trovate"
+        return index.section(CONCLUSION_KEYWORDS, limit=self._section_budget()) or "Conclusioni non trovate"
     
-    def _extract_date(self, soup):
+    def _extract_date(self, index):
         """Estrae la data di pubblicazione"""
-        date_selectors = [
-            '.publication-date',
-            '.date',
-            '.published-date',
-            '[data-testid="date"]',
-            'time'
-        ]
-        
-        for selector in date_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                return elem.get_text().strip()
-        
-        return "Data non trovata"
+        return self._first_text(index, DATE_SELECTORS) or "Data non trovata"
     
-    def _extract_journal(self, soup):
+    def _extract_journal(self, index):
         """Estrae il nome della rivista"""
-        journal_selectors = [
-            '.journal-name',
-            '.publication-title',
-            '.journal',
-            '[data-testid="journal"]'
-        ]
-        
-        for selector in journal_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                return elem.get_text().strip()
-        
-        return "Rivista non trovata"
+        return self._first_text(index, JOURNAL_SELECTORS) or "Rivista non trovata"
     
-    def _extract_doi(self, soup):
+    def _extract_doi(self, index):
         """Estrae il DOI"""
-        doi_pattern = r'10\.\d{4,}/[-._;()/:\w]+'
-        
-        text = soup.get_text()
-        doi_match = re.search(doi_pattern, text)
+        doi_match = DOI_RE.search(index.page_text)
         if doi_match:
             return doi_match.group()
         
-        doi_selectors = ['.doi', '[data-testid="doi"]', '.identifier']
-        for selector in doi_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                doi_match = re.search(doi_pattern, elem.get_text())
-                if doi_match:
-                    return doi_match.group()
+        for elem in index.all(DOI_SELECTORS):
+            doi_match = DOI_RE.search(elem.get_text())
+            if doi_match:
+                return doi_match.group()
         
         return "DOI non trovato"
     
-    def _is_peer_reviewed(self, soup):
+    def _is_peer_reviewed(self, index):
         """Determina se è peer-reviewed"""
-        peer_reviewed_indicators = [
-            'peer-reviewed',
-            'peer review',
-            'refereed',
-            'academic journal',
-            'scientific journal'
-        ]
-        
-        text = soup.get_text().lower()
-        for indicator in peer_reviewed_indicators:
-            if indicator in text:
-                return True
-        
-        return False
+        text = index.page_text.lower()
+        return any(indicator in text for indicator in PEER_REVIEWED_INDICATORS)
     
-    def _extract_full_text(self, soup):
-        """Estrae il testo completo dello studio"""
-        for elem in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-            elem.decompose()
-        
-        paragraphs = soup.find_all('p')
-        text_parts = []
-        
-        for p in paragraphs:
-            text = p.get_text().strip()
-            if len(text) > 50:  # Solo paragrafi significativi
-                text_parts.append(text)
-        
-        return ' '.join(text_parts[:2000])  # Primi 2000 caratteri
+    def _extract_full_text(self, index, abstract=None):
+        """Estrae il testo dello studio entro il budget di caratteri, prima abstract, metodi, risultati e conclusioni"""
+        if abstract and abstract != MISSING_SECTIONS['abstract']:
+            # Abstract già estratto (anche da div.abstract o dai metadati): apre il testo al posto della sezione
+            return index.budgeted_text(get_content_budget(), priority=PRIORITY_SECTIONS[1:], skip=BACK_MATTER_KEYWORDS,
+                                       lead=f"Abstract: {abstract}")
+        return index.budgeted_text(get_content_budget(), priority=PRIORITY_SECTIONS, skip=BACK_MATTER_KEYWORDS)
+    
+    def _section_budget(self):
+        # Ogni sezione può occupare al più un quarto del budget complessivo
+        return get_content_budget() // len(PRIORITY_SECTIONS)
     
     def analyze_study_quality(self, study_info):
         """Analizza la qualità dello studio"""
@@ -5,6 +5,8 @@ from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
 import urllib.parse
 
+from .http_client import get_http_client
+
 class ScrapingDogIntegration:
     """Integrazione con ScrapingDog per ricerche reali"""
     
@@ -24,7 +26,7 @@ class ScrapingDogIntegration:
                 'gl': 'it' if language == 'it' else 'us'
             }
             
-            response = requests.get(self.base_url, params=params)
+            response = get_http_client().get(self.base_url, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -63,7 +65,7 @@ class ScrapingDogIntegration:
                 'tbm': 'nws'  # Google News
             }
             
-            response = requests.get(self.base_url, params=params)
+            response = get_http_client().get(self.base_url, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -0,0 +1,211 @@
+import re
+
+from bs4 import CData, NavigableString
+
+from .content_extractor import BLOCK_TAGS, truncate_text
+
+HEADING_TAGS = frozenset({'h1', 'h2', 'h3', 'h4'})
+
+# Parti della pagina escluse dal testo delle sezioni e dal testo completo
+SKIPPED_TAGS = frozenset({'script', 'style', 'nav', 'header', 'footer', 'aside', 'noscript', 'template'})
+
+# Elementi mai visibili, esclusi anche dal testo dell'intera pagina
+INVISIBLE_TAGS = frozenset({'script', 'style', 'noscript', 'template'})
+
+_SIMPLE_SELECTOR_RE = re.compile(r'^(?P<tag>[a-z0-9]+)?(?:\.(?P<cls>[-\w]+))?(?:\[data-testid="(?P<testid>[^"]+)"\])?$')
+
+def _selector_keys(selector):
+    """Chiave di indice per un selettore semplice: 'tag', '.classe', 'tag.classe' o '[data-testid="x"]'"""
+    match = _SIMPLE_SELECTOR_RE.match(selector)
+    if not match or not any(match.groupdict().values()):
+        raise ValueError(f"Selettore non supportato dall'indice: {selector}")
+    return (match.group('tag'), match.group('cls'), match.group('testid'))
+
+class SectionIndex:
+    """Indice di una pagina costruito con una sola visita dell'albero.
+    
+    Raccoglie il testo visibile dell'intera pagina, il testo del corpo (senza script,
+    menu, header e footer) con gli intervalli di ogni sezione (titolo h1-h4 → testo
+    fino al titolo successivo), i paragrafi e gli elementi che corrispondono ai
+    selettori indicati in watch. Gli estrattori leggono da qui invece di
+    riattraversare il documento; l'albero non viene modificato.
+    """
+    
+    def __init__(self, root, watch=()):
+        self._watch = {_selector_keys(selector): selector for selector in watch}
+        self._watched_tags = {key[0] for key in self._watch if key[0]}
+        self._matches = {selector: [] for selector in self._watch.values()}
+        self.sections = []
+        self.paragraphs = []
+        self._page_text = None
+        self._build(root)
+    
+    def _register(self, node):
+        """Associa l'elemento ai selettori osservati che lo descrivono"""
+        classes = node.get('class') or ()
+        testid = node.get('data-testid')
+        for (tag, cls, wanted_testid), selector in self._watch.items():
+            if tag and tag != node.name:
+                continue
+            if cls and cls not in classes:
+                continue
+            if wanted_testid and wanted_testid != testid:
+                continue
+            self._matches[selector].append(node)
+    
+    def _build(self, root):
+        string_types = root.interesting_string_types or (NavigableString, CData)
+        if isinstance(string_types, type):
+            string_types = (string_types,)
+        
+        page = []
+        body = []
+        length = 0
+        heading_start = None
+        heading_part = None
+        paragraph_starts = []
+        
+        # Elementi della pila: (nodo, stato) con stato 'body', 'page' (parte esclusa dal corpo) o 'exit'
+        stack = [(child, 'body') for child in reversed(root.contents)]
+        while stack:
+            node, state = stack.pop()
+            
+            if state == 'exit':
+                if node.name in HEADING_TAGS and heading_start is not None:
+                    heading = ' '.join(''.join(body[heading_part:]).split())
+                    if self.sections:
+                        self.sections[-1][2] = heading_start
+                    self.sections.append([heading, length, None])
+                    heading_start = None
+                elif node.name == 'p' and paragraph_starts:
+                    self.paragraphs.append((paragraph_starts.pop(), length))
+                continue
+            
+            if isinstance(node, NavigableString):
+                if type(node) in string_types:
+                    page.append(node)
+                    if state == 'body':
+                        body.append(node)
+                        length += len(node)
+                continue
+            
+            if node.name in INVISIBLE_TAGS:
+                continue
+            if self._watch and (node.get('class') or node.get('data-testid') or node.name in self._watched_tags):
+                self._register(node)
+            
+            if node.name in BLOCK_TAGS:
+                page.append(' ')
+            if state == 'body' and node.name in SKIPPED_TAGS:
+                state = 'page'
+            if state == 'body':
+                if node.name in BLOCK_TAGS:
+                    body.append(' ')
+                    length += 1
+                if node.name in HEADING_TAGS and heading_start is None:
+                    heading_start = length
+                    heading_part = len(body)
+                    stack.append((node, 'exit'))
+                elif node.name == 'p':
+                    paragraph_starts.append(length)
+                    stack.append((node, 'exit'))
+            stack.extend((child, state) for child in reversed(node.contents))
+        
+        self.body_text = ''.join(body)
+        self._page_parts = page
+        if self.sections:
+            self.sections[-1][2] = length
+    
+    @property
+    def page_text(self):
+        """Testo visibile dell'intera pagina, inclusi header e footer"""
+        if self._page_text is None:
+            self._page_text = ''.join(self._page_parts)
+            self._page_parts = None
+        return self._page_text
+    
+    def first(self, selectors):
+        """Primo elemento che corrisponde al primo selettore con risultati, o None"""
+        for selector in selectors:
+            found = self._matches.get(selector)
+            if found:
+                return found[0]
+        return None
+    
+    def all(self, selectors):
+        """Tutti gli elementi che corrispondono ai selettori, nell'ordine dei selettori"""
+        return [node for selector in selectors for node in self._matches.get(selector, ())]
+    
+    def _find_section(self, keywords):
+        """Posizione della prima sezione con contenuto il cui titolo contiene una delle parole chiave"""
+        for keyword in keywords:
+            pattern = re.compile(keyword, re.I)
+            for position, (heading, start, end) in enumerate(self.sections):
+                if pattern.search(heading) and self.body_text[start:end].strip():
+                    return position
+        return None
+    
+    def section(self, keywords, limit=None):
+        """Testo della prima sezione con contenuto il cui titolo contiene una delle parole chiave.
+        
+        Le parole chiave sono provate in ordine, come priorità; limit tronca il testo.
+        """
+        position = self._find_section(keywords)
+        if position is None:
+            return None
+        _, start, end = self.sections[position]
+        if limit:
+            # Margine per gli spazi che verranno compressi
+            end = min(end, start + limit * 2)
+        return truncate_text(' '.join(self.body_text[start:end].split()), limit)
+    
+    def paragraph_texts(self, min_length=0):
+        """Testi dei paragrafi del corpo più lunghi di min_length caratteri"""
+        texts = []
+        for start, end in self.paragraphs:
+            text = self.body_text[start:end].strip()
+            if len(text) > min_length:
+                texts.append(text)
+        return texts
+    
+    def budgeted_text(self, budget, priority=(), skip=(), min_length=50, lead=None):
+        """Testo del corpo entro budget caratteri, cominciando dalle sezioni più informative.
+        
+        lead (es. l'abstract già estratto da metadati o selettori) apre il testo; poi
+        entrano le sezioni indicate dai gruppi di parole chiave in priority, ognuna con
+        una quota uguale del budget; ciò che resta va agli altri paragrafi in ordine di
+        pagina, escluse le sezioni con titoli in skip (es. bibliografia).
+        """
+        parts = []
+        used = 0
+        taken = set()
+        share = budget // max(len(priority) + bool(lead), 1)
+        if lead:
+            lead = ' '.join(lead.split())
+            parts.append(truncate_text(lead, share))
+            used += len(parts[-1]) + 1
+        for keywords in priority:
+            if used >= budget:
+                break
+            position = self._find_section(keywords)
+            if position is None or position in taken:
+                continue
+            taken.add(position)
+            heading = self.sections[position][0]
+            text = self.section(keywords, limit=min(share, budget - used))
+            parts.append(f"{heading}: {text}")
+            used += len(parts[-1]) + 1
+        
+        skip_patterns = [re.compile(keyword, re.I) for keyword in skip]
+        excluded = [(start, end) for position, (heading, start, end) in enumerate(self.sections)
+                    if position in taken or any(pattern.search(heading) for pattern in skip_patterns)]
+        for start, end in self.paragraphs:
+            if used >= budget:
+                break
+            if any(span_start <= start < span_end for span_start, span_end in excluded):
+                continue
+            text = ' '.join(self.body_text[start:end].split())
+            if len(text) > min_length and not (lead and text in lead):
+                parts.append(text)
+                used += len(text) + 1
+        return truncate_text(' '.join(parts), budget)
@@ -0,0 +1,46 @@
+import threading
+import time
+from pathlib import Path
+
+from .settings import get_data_dir
+from .storage import load_json, process_singleton, save_json
+
+class SelectorMemory:
+    """Ricorda, per ogni dominio, quale metodo di estrazione ha funzionato l'ultima volta.
+    
+    Un percorso è un dizionario {'method': 'selector' | 'density' | 'paragraphs',
+    'selector': ...}. Alla visita successiva dello stesso dominio viene provato per
+    primo; se smette di funzionare viene sostituito dal nuovo vincitore.
+    """
+    
+    def __init__(self, path=None):
+        self.path = Path(path) if path else get_data_dir() / "extraction_paths.json"
+        self._lock = threading.Lock()
+        self._entries = load_json(self.path)
+    
+    def get(self, domain):
+        """Percorso vincente memorizzato per il dominio, o None"""
+        with self._lock:
+            entry = self._entries.get(domain)
+            return entry['path'] if entry else None
+    
+    def record(self, domain, path):
+        """Registra il percorso che ha prodotto il contenuto; salva solo se cambia"""
+        with self._lock:
+            entry = self._entries.get(domain)
+            if entry and entry['path'] == path:
+                entry['hits'] += 1
+                return
+            self._entries[domain] = {'path': path, 'hits': 1, 'updated_at': time.time()}
+            save_json(self.path, self._entries)
+    
+    def forget(self, domain):
+        with self._lock:
+            if self._entries.pop(domain, None) is not None:
+                save_json(self.path, self._entries)
+
+_selector_memory = process_singleton(SelectorMemory)
+
+def get_selector_memory():
+    """Restituisce la memoria dei percorsi di estrazione condivisa dal processo"""
+    return _selector_memory()
@@ -3,6 +3,8 @@ import requests
 import json
 from typing import List, Dict, Optional
 
+from .http_client import get_http_client
+
 class SerpAPIIntegration:
     """Integrazione con SerpAPI per ricerche reali"""
     
@@ -23,7 +25,7 @@ class SerpAPIIntegration:
                 'gl': 'it' if language == 'it' else 'us'
             }
             
-            response = requests.get(self.base_url, params=params)
+            response = get_http_client().get(self.base_url, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -63,7 +65,7 @@ class SerpAPIIntegration:
                 'gl': 'it' if language == 'it' else 'us'
             }
             
-            response = requests.get(self.base_url, params=params)
+            response = get_http_client().get(self.base_url, params=params)
             response.raise_for_status()
             
             data = response.json()
@@ -42,4 +42,16 @@ def load_settings(config_file=None):
     if 'Sources' in cp:
         settings.update(cp['Sources'])
     
+    if 'Analytics' in cp:
+        settings.update(cp['Analytics'])
+    
+    if 'Network' in cp:
+        settings.update(cp['Network'])
+    
     return settings
+
+def get_data_dir():
+    """Restituisce la directory dei dati persistenti (cache, database), creandola se manca"""
+    data_dir = Path.home() / ".news_agent"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    return data_dir
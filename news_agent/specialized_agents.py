@@ -4,6 +4,7 @@ import re
 from .ai_providers import create_ai_provider
 from .serpapi_integration import SerpAPIIntegration
 from .settings import load_settings
+from .study_cache import find_dois, get_study_cache, normalize_doi
 
 class SpecializedAgent:
     def __init__(self, specialization, ai_provider):
@@ -257,9 +258,9 @@ class ScientificAgent(SpecializedAgent):
         """Valuta i risultati per notizie scientifiche e analizza le lacune degli studi"""
         
         if study_info:
-            study_analysis = self._analyze_specific_study_with_info(queries, results, study_info)
+            study_analysis = self._analyze_specific_study_with_info(queries, results, study_info, article)
         else:
-            study_analysis = self._analyze_specific_study(queries, results)
+            study_analysis = self._analyze_specific_study(queries, results, article)
         
         prompt = f"""
         Sei un CRITICO METODOLOGICO SCIENTIFICO RIGOROSO. Il tuo compito è VALUTARE LA QUALITÀ SCIENTIFICA DELLO STUDIO con criteri FERREI.
@@ -359,71 +360,41 @@ class ScientificAgent(SpecializedAgent):
                 "spiegazione": f"Impossibile valutare i risultati delle ricerche. La notizia potrebbe essere vera ma non verificabile con le fonti attuali."
             }
     
-    def _analyze_specific_study(self, queries, results):
+    def _analyze_specific_study(self, queries, results, article=None):
         """Analizza lo studio specifico menzionato nella notizia"""
         try:
             from .scientific_study_scraper import ScientificStudyScraper
             
             scraper = ScientificStudyScraper()
             
-            study_info = self._extract_study_info(queries, results)
+            # Un DOI citato nella notizia porta direttamente allo studio, senza ricerche
+            study_content, quality_analysis = self._study_from_article_dois(scraper, article)
             
-            if not study_info:
-                return "Nessuna informazione sullo studio trovata"
-            
-            study_urls = scraper.find_study_urls(
-                study_info.get('study_name', ''),
-                study_info.get('author_name', '')
-            )
-            
-            if not study_urls:
-                return "Nessun URL dello studio trovato"
-            
-            study_url = study_urls[0]['url']
-            study_content = scraper.scrape_study_content(study_url)
+            if not study_content:
+                study_info = self._extract_study_info(queries, results)
+                
+                if not study_info:
+                    return "Nessuna informazione sullo studio trovata"
+                
+                study_urls = scraper.find_study_urls(
+                    study_info.get('study_name', ''),
+                    study_info.get('author_name', '')
+                )
+                
+                if not study_urls:
+                    return "Nessun URL dello studio trovato"
+                
+                study_content, quality_analysis = self._load_study(scraper, study_urls[0], study_info.get('author_name'))
             
             if not study_content:
                 return "Impossibile accedere al contenuto dello studio"
             
-            quality_analysis = scraper.analyze_study_quality(study_content)
-            analysis = f"""
-ANALISI DELLO STUDIO SPECIFICO:
-Titolo: {study_content.get('title', 'N/A')}
-Autori: {', '.join(study_content.get('authors', []))}
-Rivista: {study_content.get('journal', 'N/A')}
-DOI: {study_content.get('doi', 'N/A')}
-Data: {study_content.get('publication_date', 'N/A')}
-Peer-reviewed: {'Sì' if study_content.get('peer_reviewed') else 'No'}
-
-QUALITÀ DELLO STUDIO:
-Punteggio: {quality_analysis['score']}/{quality_analysis['max_score']} ({quality_analysis['percentage']:.1f}%)
-Qualità generale: {quality_analysis['overall_quality']}
-
-PUNTI DI FORZA:
-{chr(10).join(f'- {strength}' for strength in quality_analysis['strengths'])}
-
-PROBLEMI IDENTIFICATI:
-{chr(10).join(f'- {issue}' for issue in quality_analysis['issues'])}
-
-ABSTRACT:
-{study_content.get('abstract', 'N/A')[:300]}...
-
-METODOLOGIA:
-{study_content.get('methodology', 'N/A')[:300]}...
-
-RISULTATI:
-{study_content.get('results', 'N/A')[:300]}...
-
-CONCLUSIONI:
-{study_content.get('conclusions', 'N/A')[:300]}...
-"""
-            
-            return analysis
+            return self._format_study_analysis(study_content, quality_analysis)
             
         except Exception as e:
             return f"Errore nell'analisi dello studio: {e}"
     
-    def _analyze_specific_study_with_info(self, queries, results, study_info):
+    def _analyze_specific_study_with_info(self, queries, results, study_info, article=None):
         """Analizza lo studio specifico usando le informazioni fornite dall'orchestratore"""
         try:
             from .scientific_study_scraper import ScientificStudyScraper
@@ -434,43 +405,100 @@ CONCLUSIONI:
             author_name = study_info.get('author_name', '')
             journal = study_info.get('journal', '')
             
-            if not study_name and not author_name:
-                return "Informazioni insufficienti sullo studio"
-            
             search_terms = []
-            if author_name and study_name:
-                search_terms.append(f"{author_name} {study_name}")
-                search_terms.append(f"{study_name} {author_name}")
-            if author_name:
-                search_terms.append(f"{author_name} studio")
-                search_terms.append(f"{author_name} ricerca")
-                search_terms.append(f"{author_name} paper")
-            if study_name:
-                search_terms.append(f"{study_name} studio")
-                search_terms.append(f"{study_name} ricerca")
-            if journal and author_name:
-                search_terms.append(f"{journal} {author_name}")
-                search_terms.append(f"{author_name} {journal}")
-            
             study_urls = []
-            for term in search_terms:
-                urls = scraper.find_study_urls(term, author_name)
-                if urls:
-                    study_urls.extend(urls)
-                    break
+            study_content, quality_analysis = self._study_from_article_dois(scraper, article)
             
-            if not study_urls:
-                return f"Nessun URL trovato per {author_name or 'autore sconosciuto'} - {study_name or 'studio sconosciuto'}"
-            
-            study_url = study_urls[0]['url']
-            study_content = scraper.scrape_study_content(study_url)
+            if not study_content:
+                if not study_name and not author_name:
+                    return "Informazioni insufficienti sullo studio"
+                
+                if author_name and study_name:
+                    search_terms.append(f"{author_name} {study_name}")
+                    search_terms.append(f"{study_name} {author_name}")
+                if author_name:
+                    search_terms.append(f"{author_name} studio")
+                    search_terms.append(f"{author_name} ricerca")
+                    search_terms.append(f"{author_name} paper")
+                if study_name:
+                    search_terms.append(f"{study_name} studio")
+                    search_terms.append(f"{study_name} ricerca")
+                if journal and author_name:
+                    search_terms.append(f"{journal} {author_name}")
+                    search_terms.append(f"{author_name} {journal}")
+                
+                # Tutte le varianti su tutti i motori in parallelo, candidati ordinati per pertinenza
+                study_urls = scraper.discover_study_urls(search_terms, author_name=author_name,
+                                                         study_name=study_name, journal=journal)
+                
+                if not study_urls:
+                    return f"Nessun URL trovato per {author_name or 'autore sconosciuto'} - {study_name or 'studio sconosciuto'}"
+                
+                for candidate in study_urls[:3]:
+                    study_content, quality_analysis = self._load_study(scraper, candidate, author_name)
+                    if study_content:
+                        break
             
             if not study_content:
                 return f"Impossibile accedere al contenuto dello studio di {author_name or 'autore sconosciuto'}"
             
-            quality_analysis = scraper.analyze_study_quality(study_content)
+            analysis = self._format_study_analysis(study_content, quality_analysis, journal)
+            analysis += f"""
+ANALISI CRITICA SPECIFICA:
+- Autore identificato: {author_name or 'Non identificato'}
+- Studio identificato: {study_name or 'Non identificato'}
+- Rivista identificata: {journal or 'Non identificata'}
+- Ricerca specifica eseguita: {'Sì' if study_urls else 'No'}
+- Termini di ricerca utilizzati: {', '.join(search_terms[:3]) or 'nessuno (DOI citato nella notizia)'}
+"""
+            
+            return analysis
             
-            analysis = f"""
+        except Exception as e:
+            return f"Errore nell'analisi dello studio specifico: {e}"
+    
+    def _study_from_article_dois(self, scraper, article):
+        """Studio e valutazione per il primo DOI citato nella notizia, da cache o da doi.org"""
+        if not article:
+            return None, None
+        
+        dois = find_dois(f"{article.get('title', '')} {article.get('content', article.get('summary', ''))}")
+        if not dois:
+            return None, None
+        
+        cache = get_study_cache()
+        for doi in dois:
+            record = cache.get(doi=doi) if cache else None
+            if record:
+                print(f"⚡ Studio {doi} già analizzato, uso l'archivio")
+                return record['study_info'], record['quality']
+        
+        # Nessun DOI in archivio: doi.org rimanda direttamente alla pagina dell'editore
+        return self._load_study(scraper, {'url': f"https://doi.org/{dois[0]}", 'doi': dois[0]})
+    
+    def _load_study(self, scraper, candidate, author_name=None):
+        """Contenuto e valutazione di un candidato: dall'archivio se già noto, altrimenti scraping"""
+        cache = get_study_cache()
+        if cache:
+            record = cache.get(doi=candidate.get('doi'), title=candidate.get('title'), first_author=author_name)
+            if record:
+                print(f"⚡ Studio già analizzato, uso l'archivio: {record['study_info'].get('title', '')}")
+                return record['study_info'], record['quality']
+        
+        study_content = scraper.scrape_study_content(candidate['url'])
+        if not study_content:
+            return None, None
+        
+        if candidate.get('doi') and not normalize_doi(study_content.get('doi')):
+            study_content['doi'] = candidate['doi']
+        quality_analysis = scraper.analyze_study_quality(study_content)
+        if cache:
+            # Il DOI richiesto resta una chiave anche se la pagina ne riporta un altro (preprint, versione)
+            cache.put(study_content, quality_analysis, dois=[candidate.get('doi')])
+        return study_content, quality_analysis
+    
+    def _format_study_analysis(self, study_content, quality_analysis, journal=None):
+        return f"""
 ANALISI DELLO STUDIO SPECIFICO:
 Titolo: {study_content.get('title', 'N/A')}
 Autori: {', '.join(study_content.get('authors', []))}
@@ -500,19 +528,7 @@ RISULTATI:
 
 CONCLUSIONI:
 {study_content.get('conclusions', 'N/A')[:300]}...
-
-ANALISI CRITICA SPECIFICA:
-- Autore identificato: {author_name or 'Non identificato'}
-- Studio identificato: {study_name or 'Non identificato'}
-- Rivista identificata: {journal or 'Non identificata'}
-- Ricerca specifica eseguita: {'Sì' if study_urls else 'No'}
-- Termini di ricerca utilizzati: {', '.join(search_terms[:3])}
 """
-            
-            return analysis
-            
-        except Exception as e:
-            return f"Errore nell'analisi dello studio specifico: {e}"
     
     def _extract_study_info(self, queries, results):
         """Estrae informazioni sullo studio dalle query e risultati"""
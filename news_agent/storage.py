@@ -0,0 +1,35 @@
+import json
+import os
+import threading
+
+def load_json(path):
+    """Dizionario salvato in un file JSON, vuoto se il file manca o è corrotto"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_json(path, data):
+    """Scrive data in un file JSON in modo atomico; gli errori di disco vengono ignorati"""
+    tmp_path = path.with_suffix('.tmp')
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+def process_singleton(factory):
+    """Funzione che restituisce l'istanza condivisa dal processo, creata da factory alla prima chiamata"""
+    lock = threading.Lock()
+    instance = None
+    
+    def get():
+        nonlocal instance
+        with lock:
+            if instance is None:
+                instance = factory()
+            return instance
+    return get
@@ -0,0 +1,162 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import zlib
+from pathlib import Path
+
+from .metadata import DOI_RE
+from .settings import get_data_dir
+
+DEFAULT_TTL = 30 * 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS studies (
+    key TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS study_aliases (
+    alias TEXT PRIMARY KEY,
+    key TEXT NOT NULL
+);
+"""
+
+# Valori segnaposto degli estrattori, da non usare come chiave
+PLACEHOLDERS = {'DOI non trovato', 'Titolo non trovato', 'Autori non trovati'}
+
+def normalize_doi(doi):
+    """DOI in forma canonica (minuscolo, senza prefisso né punteggiatura finale), o None"""
+    if not doi or doi in PLACEHOLDERS:
+        return None
+    match = DOI_RE.search(doi)
+    if not match:
+        return None
+    return match.group().rstrip('.,;:)]').lower()
+
+def find_dois(text):
+    """DOI citati in un testo, in ordine di apparizione e senza duplicati"""
+    if not text:
+        return []
+    return list(dict.fromkeys(filter(None, (normalize_doi(match.group()) for match in DOI_RE.finditer(text)))))
+
+def _normalize_words(text):
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii').lower()
+    return ' '.join(re.findall(r'[a-z0-9]+', text))
+
+def title_key(title, first_author):
+    """Chiave per gli studi senza DOI: titolo normalizzato + cognome del primo autore"""
+    if not title or title in PLACEHOLDERS or not first_author or first_author in PLACEHOLDERS:
+        return None
+    # "Rossi, Mario" (formato citation_author) oppure "Mario Rossi"
+    if ',' in first_author:
+        surname = first_author.split(',')[0]
+    else:
+        parts = first_author.split()
+        surname = parts[-1] if parts else ''
+    title, surname = _normalize_words(title), _normalize_words(surname)
+    if not title or not surname:
+        return None
+    return f"title:{title}|{surname}"
+
+def study_keys(study_info):
+    """Chiavi con cui uno studio può essere ritrovato: DOI e/o titolo + primo autore"""
+    keys = []
+    doi = normalize_doi(study_info.get('doi'))
+    if doi:
+        keys.append(f"doi:{doi}")
+    authors = study_info.get('authors') or []
+    key = title_key(study_info.get('title'), authors[0] if authors else None)
+    if key:
+        keys.append(key)
+    return keys
+
+class StudyCache:
+    """Archivio su disco degli studi già analizzati, indicizzato per DOI.
+    
+    Ogni voce contiene study_info estratto e il risultato di analyze_study_quality.
+    Gli studi senza DOI sono indicizzati per titolo normalizzato e primo autore;
+    quando uno studio ha entrambi, anche la chiave per titolo porta alla stessa voce.
+    """
+    
+    def __init__(self, path=None, ttl=DEFAULT_TTL):
+        self.path = Path(path) if path else get_data_dir() / "study_cache.db"
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+    
+    def _get_key(self, key):
+        with self._lock:
+            row = self.conn.execute("""
+                SELECT studies.key, data, created_at FROM studies
+                LEFT JOIN study_aliases ON study_aliases.key = studies.key
+                WHERE studies.key = ? OR study_aliases.alias = ?
+            """, (key, key)).fetchone()
+            if row is None:
+                return None
+            primary, data, created_at = row
+            if time.time() - created_at > self.ttl:
+                with self.conn:
+                    self.conn.execute("DELETE FROM studies WHERE key = ?", (primary,))
+                    self.conn.execute("DELETE FROM study_aliases WHERE key = ?", (primary,))
+                return None
+        try:
+            return json.loads(zlib.decompress(data).decode('utf-8'))
+        except (zlib.error, ValueError):
+            return None
+    
+    def get(self, doi=None, title=None, first_author=None):
+        """Voce in cache ({'study_info', 'quality'}) per DOI o per titolo + primo autore, o None"""
+        doi = normalize_doi(doi)
+        if doi:
+            record = self._get_key(f"doi:{doi}")
+            if record:
+                return record
+        key = title_key(title, first_author)
+        return self._get_key(key) if key else None
+    
+    def put(self, study_info, quality, dois=()):
+        """Salva uno studio e la sua valutazione; restituisce False se non ha né DOI né titolo e autore.
+        
+        dois sono altri DOI con cui lo studio è stato cercato (es. quello citato nell'articolo,
+        diverso da quello della pagina): diventano alias della stessa voce.
+        """
+        keys = study_keys(study_info)
+        for doi in filter(None, map(normalize_doi, dois)):
+            if f"doi:{doi}" not in keys:
+                keys.append(f"doi:{doi}")
+        if not keys:
+            return False
+        data = zlib.compress(json.dumps({'study_info': study_info, 'quality': quality}, ensure_ascii=False).encode('utf-8'), 6)
+        primary, aliases = keys[0], keys[1:]
+        with self._lock:
+            with self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO studies (key, data, created_at) VALUES (?, ?, ?)",
+                                  (primary, data, time.time()))
+                self.conn.executemany("INSERT OR REPLACE INTO study_aliases (alias, key) VALUES (?, ?)",
+                                      [(alias, primary) for alias in aliases])
+        return True
+    
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+_study_cache = None
+_study_cache_lock = threading.Lock()
+
+def get_study_cache():
+    """Restituisce l'archivio degli studi condiviso dal processo (None se il disco non è disponibile)"""
+    global _study_cache
+    with _study_cache_lock:
+        if _study_cache is None:
+            try:
+                _study_cache = StudyCache()
+            except sqlite3.Error as e:
+                print(f"⚠️ Archivio degli studi non disponibile: {e}")
+                _study_cache = False
+        return _study_cache or None
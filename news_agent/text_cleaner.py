@@ -0,0 +1,41 @@
+import re
+import html
+
+# Pattern precompilati condivisi da fetcher, scraper e UI
+_TAG_RE = re.compile(r'<[^<]+?>')
+_ENTITY_RE = re.compile(r'&[a-zA-Z0-9#]+;')
+_CONTROL_RE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])|[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]')
+
+def normalize_text(text, strip_tags=False):
+    """Rimuove tag HTML, entità e spazi superflui da titoli, sommari e autori dei feed"""
+    if not text:
+        return ""
+    
+    if strip_tags and '<' in text:
+        text = _TAG_RE.sub('', text)
+    
+    if '&' in text:
+        text = html.unescape(text)
+        # Entità rimaste dopo l'unescape (es. doppio escape nei feed)
+        if '&' in text:
+            text = _ENTITY_RE.sub('', text)
+    
+    return ' '.join(text.split())
+
+def normalize_many(texts, strip_tags=False):
+    """Versione batch di normalize_text: lista in ingresso, lista in uscita"""
+    return [normalize_text(text, strip_tags) for text in texts]
+
+def clean_control_text(text):
+    """Rimuove sequenze ANSI e caratteri di controllo e compatta gli spazi"""
+    if not text:
+        return ""
+    
+    if not (text.isascii() and text.isprintable()):
+        text = _CONTROL_RE.sub('', text)
+    
+    return ' '.join(text.split())
+
+def clean_control_many(texts):
+    """Versione batch di clean_control_text: lista in ingresso, lista in uscita"""
+    return [clean_control_text(text) for text in texts]
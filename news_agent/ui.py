@@ -4,18 +4,30 @@ import webbrowser
 import sys
 import select
 import platform
+import time
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
 
-def get_arrow_input():
-    """Gestisce l'input con supporto per le frecce cross-platform"""
+from .text_cleaner import clean_control_text
+
+def get_arrow_input(timeout=None):
+    """Gestisce l'input con supporto per le frecce cross-platform.
+    
+    Con timeout restituisce None se nessun tasto viene premuto entro quel numero di secondi.
+    """
     console = Console()
     
     if platform.system() == "Windows":
         try:
             import msvcrt
+            if timeout is not None:
+                deadline = time.monotonic() + timeout
+                while not msvcrt.kbhit():
+                    if time.monotonic() >= deadline:
+                        return None
+                    time.sleep(0.05)
             ch = msvcrt.getch()
             
             if ch in [b'\xe0', b'\x00']:
@@ -47,6 +59,11 @@ def get_arrow_input():
             try:
                 tty.setraw(sys.stdin.fileno())
                 
+                if timeout is not None:
+                    ready, _, _ = select.select([sys.stdin], [], [], timeout)
+                    if not ready:
+                        return None
+                
                 ch = sys.stdin.read(1)
 
                 if ch == '\x1b':
@@ -76,27 +93,36 @@ def show_table(articles, page, per_page, selected_idx=None):
     table.add_column("#", justify="center", style="bold red", no_wrap=True)
     table.add_column("Data", style="bold yellow", no_wrap=True)
     table.add_column("Fonte", style="bold yellow", no_wrap=True)
+    table.add_column("Fonti", justify="center", style="cyan", no_wrap=True)
     table.add_column("Titolo", style="bold white")
     start = (page - 1) * per_page
     end = start + per_page
-    for i, article in enumerate(articles[start:end], start=start):
+    shown = articles[start:end]
+    for i, article in enumerate(shown, start=start):
         style = "bold white on blue" if selected_idx == i else ("none" if i % 2 == 0 else "dim")
         source = article.get('source', 'Sconosciuto')
-        table.add_row(str(i), article['date'][:16], source, article['title'], style=style)
+        source_count = article.get('source_count', 1)
+        table.add_row(str(i), article['date'][:16], source, str(source_count), article['title'], style=style)
     console = Console()
     console.print(table)
     
     commands = "Comandi: ↑↓=naviga, Invio=apri articolo, n=avanti, p=indietro, [0-9]=seleziona articolo, o=apri link browser, v=analisi critica, c=configurazione, q=esci"
     console.print(f"[i]{commands}[/i]")
+    return shown
 
 def show_article(article):
     os.system('clear' if os.name == 'posix' else 'cls')
     
     content = article.get('content', article.get('summary', 'Contenuto non disponibile'))
     
+    sources_line = ""
+    if article.get('source_count', 1) > 1:
+        sources_line = f"[yellow]Riportata da {article['source_count']} fonti: {', '.join(article.get('sources', []))}[/yellow]\n\n"
+    
     article_panel = Panel(
         f"[bold blue]{article['title']}[/bold blue]\n\n"
         f"[dim]{article['date']}[/dim] [cyan]{article['author']}[/cyan]\n\n"
+        f"{sources_line}"
         f"{content}\n\n"
         f"[link={article['link']}]Leggi su Google News (premi 'o' per aprire)[/link]",
         title="[bold green]Articolo dettagliato[/bold green]"
@@ -144,62 +170,9 @@ def show_verification_results(analysis_result, model_name=None):
     os.system('clear' if os.name == 'posix' else 'cls')
     console = Console()
     
-<<<<<<< HEAD
     title = "[bold green]🧠 Analisi[/bold green]"
     if model_name:
         title += f" - {model_name}"
-=======
-
-    if agent_analysis and "VERDETTO FINALE" in agent_analysis:
-
-        parts = agent_analysis.split("VERDETTO FINALE:")
-        if len(parts) > 1:
-            analysis_part = parts[0].strip()
-            verdict_part = "VERDETTO FINALE:" + parts[1].strip()
-            
-            title = "🤖 Analisi Sistema Multi-Agente"
-            if model_name:
-                title += f" - {model_name}"
-            console.print(Panel(
-                analysis_part,
-                title=title,
-                border_style="yellow"
-            ))
-            
-
-            console.print(Panel(
-                verdict_part,
-                title="🎯 VERDETTO FINALE",
-                border_style="red"
-            ))
-        else:
-
-            title = "🤖 Analisi Sistema Multi-Agente"
-            if model_name:
-                title += f" - {model_name}"
-            console.print(Panel(
-                agent_analysis,
-                title=title,
-                border_style="yellow"
-            ))
-    else:
-
-        console.print(Panel(
-            verification_data.get('verification_summary', 'Nessun risultato'),
-            title="📊 Risultati Verifica",
-            border_style="cyan"
-        ))
-        
-        if agent_analysis:
-            title = "🤖 Analisi Agente LLM"
-            if model_name:
-                title += f" - {model_name}"
-            console.print(Panel(
-                agent_analysis,
-                title=title,
-                border_style="yellow"
-            ))
->>>>>>> main
     
     console.print(Panel(
         analysis_result,
@@ -291,17 +264,7 @@ def show_analysis_animation(console):
 
 def clean_ansi_content(text):
     """Rimuove caratteri di controllo ANSI dal testo"""
-    import re
-    
-    ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-    text = ansi_escape.sub('', text)
-    
-    text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', text)
-    
-    text = re.sub(r'\s+', ' ', text)
-    text = re.sub(r'\n\s*\n', '\n\n', text)
-    
-    return text.strip()
+    return clean_control_text(text)
 
 def show_settings_menu():
     """Mostra il menu di configurazione delle impostazioni"""
@@ -556,8 +519,65 @@ def show_current_settings():
 """
     
     console.print(Panel.fit(settings_text, title="Configurazione Attuale", border_style="green"))
+    show_feed_health(console)
+    show_http_pool_stats(console)
     console.input("\nPremi invio per tornare indietro")
 
+def show_feed_health(console):
+    """Mostra lo stato di salute dei feed e del circuit breaker"""
+    from .feed_health import get_feed_health
+    
+    summary = get_feed_health().summary()
+    if not summary:
+        return
+    
+    state_labels = {'closed': '[green]attivo[/green]', 'open': '[red]sospeso[/red]', 'half_open': '[yellow]in prova[/yellow]'}
+    table = Table(title="📡 Salute dei feed", show_lines=False)
+    table.add_column("Feed", style="cyan")
+    table.add_column("Stato")
+    table.add_column("Successo", justify="right")
+    table.add_column("p50 ms", justify="right")
+    table.add_column("p95 ms", justify="right")
+    table.add_column("Ultimo errore", overflow="fold")
+    for url, entry in sorted(summary.items()):
+        table.add_row(
+            url,
+            state_labels.get(entry['state'], entry['state']),
+            f"{entry['success_rate']:.0%}" if entry['success_rate'] is not None else '-',
+            str(entry['p50_ms'] if entry['p50_ms'] is not None else '-'),
+            str(entry['p95_ms'] if entry['p95_ms'] is not None else '-'),
+            (entry['last_error'] or '-')[:80]
+        )
+    console.print(table)
+
+def show_http_pool_stats(console):
+    """Mostra le statistiche del pool di connessioni HTTP condiviso"""
+    from .http_client import get_http_client
+    
+    stats = get_http_client().pool_stats()
+    if not stats:
+        return
+    
+    table = Table(title="🌐 Connessioni HTTP", show_lines=False)
+    table.add_column("Host", style="cyan")
+    table.add_column("Richieste", justify="right")
+    table.add_column("Errori", justify="right")
+    table.add_column("Retry", justify="right")
+    table.add_column("Media ms", justify="right")
+    table.add_column("Aperte", justify="right")
+    table.add_column("Riuso", justify="right")
+    for host, entry in sorted(stats.items(), key=lambda item: -item[1]['requests']):
+        table.add_row(
+            host,
+            str(entry['requests']),
+            str(entry['errors']),
+            str(entry['retries']),
+            str(entry['avg_ms'] if entry['avg_ms'] is not None else '-'),
+            str(entry['connections_opened']),
+            f"{entry['reuse_ratio']:.0%}" if entry['reuse_ratio'] is not None else '-'
+        )
+    console.print(table)
+
 def save_settings_change(key, value):
     """Salva una modifica nelle impostazioni"""
     from .settings import load_settings
@@ -573,17 +593,27 @@ def save_settings_change(key, value):
     ai_section = {}
     news_section = {}
     sources_section = {}
+    analytics_section = {}
+    network_section = {}
     
     ai_keys = ['provider', 'ollama_model', 'openai_model', 'claude_model', 
                'openai_api_key', 'claude_api_key', 'ollama_url']
     
     news_keys = ['lang', 'topic', 'articles_per_page', 'default_language', 
-                 'enable_multilingual']
+                 'enable_multilingual', 'auto_refresh', 'refresh_min_interval',
+                 'refresh_max_interval']
     
 
     
     sources_keys = ['quick_sources', 'default_output_language']
     
+    analytics_keys = ['enable_tracking', 'db_path', 'export_format']
+    
+    network_keys = ['http_connect_timeout', 'http_read_timeout', 'http_pool_hosts', 'http_pool_maxsize',
+                    'http_retries', 'http_backoff', 'http_max_body_mb', 'scrape_rate_per_domain',
+                    'scrape_burst', 'scrape_cache_ttl', 'scrape_cache_max_mb', 'content_budget_chars',
+                    'content_budget_tokens']
+    
     for k, v in settings.items():
         if k in ai_keys:
             ai_section[k] = v
@@ -591,6 +621,10 @@ def save_settings_change(key, value):
             news_section[k] = v
         elif k in sources_keys:
             sources_section[k] = v
+        elif k in analytics_keys:
+            analytics_section[k] = v
+        elif k in network_keys:
+            network_section[k] = v
         else:
             default_section[k] = v
     
@@ -602,6 +636,10 @@ def save_settings_change(key, value):
         config['News'] = news_section
     if sources_section:
         config['Sources'] = sources_section
+    if analytics_section:
+        config['Analytics'] = analytics_section
+    if network_section:
+        config['Network'] = network_section
     
     settings_file = os.path.join(os.path.dirname(__file__), 'settings.ini')
     
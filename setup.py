@@ -8,11 +8,18 @@ setup(
     author_email='pinperepette@gmail.com',
     description='Terminal news agent: fetches Google News, launches LLM agents, works with Ollama, terminal UI.',
     packages=find_packages(include=["news_agent", "news_agent.*"]),
+    python_requires='>=3.10',
     install_requires=[
         'requests',
         'rich',
         'beautifulsoup4',
     ],
+    extras_require={
+        # Parser HTML in C, usato automaticamente dagli scraper se installato
+        'fast': ['lxml'],
+        # Lettura degli studi pubblicati solo in PDF
+        'pdf': ['pypdf'],
+    },
     include_package_data=True,
     package_data={'': ['settings.ini']},
     entry_points={
@@ -0,0 +1,25 @@
+from news_agent.article_store import ArticleStore
+
+ARTICLE = {'title': "Terremoto in Calabria", 'link': "https://www.ansa.it/terremoto", 'source': "ANSA",
+           'sources': ["ANSA"], 'source_count': 1}
+
+def test_upsert_keeps_sources_added_by_later_polls(tmp_path):
+    store = ArticleStore(tmp_path / "articles.db")
+    store.upsert_many([ARTICLE])
+    store.update_sources([{'link': ARTICLE['link'], 'sources': ["ANSA", "RaiNews", "Corriere della Sera"]}])
+    store.upsert_many([ARTICLE])
+    
+    article = store.get_by_link(ARTICLE['link'])
+    assert article['sources'] == ("ANSA", "RaiNews", "Corriere della Sera")
+    assert article['source_count'] == 3
+    store.close()
+
+def test_source_count_follows_the_merged_list(tmp_path):
+    store = ArticleStore(tmp_path / "articles.db")
+    store.upsert_many([dict(ARTICLE, source_count=5)])
+    store.upsert_many([dict(ARTICLE, source="RaiNews", sources=["RaiNews"])])
+    
+    article = store.get_by_link(ARTICLE['link'])
+    assert article['sources'] == ("ANSA", "RaiNews")
+    assert article['source_count'] == 2
+    store.close()
@@ -0,0 +1,28 @@
+from news_agent.dedup import dedupe_articles, simhash
+
+def _article(title, link, source=''):
+    return {'title': title, 'link': link, 'summary': '', 'source': source}
+
+def test_simhash_keeps_short_numbers():
+    assert simhash("Lotto: estratto il 7") != simhash("Lotto: estratto il 12")
+
+def test_titles_differing_only_by_number_stay_separate():
+    numbers = (7, 12, 3, 45, 88, 21, 90, 1, 33, 64)
+    articles = [_article(f"Lotto: estratto il {n}", f"https://example.it/lotto/{n}") for n in numbers]
+    assert len(dedupe_articles(articles)) == len(numbers)
+    
+    articles = [_article(f"Lotto, estrazione del {n} ottobre: i numeri vincenti", f"https://example.it/estrazione/{n}")
+                for n in numbers]
+    assert len(dedupe_articles(articles)) == len(numbers)
+
+def test_syndicated_copies_are_merged():
+    title = "Terremoto in Calabria, scossa di magnitudo 4.2 avvertita a Cosenza"
+    articles = [
+        _article(f"{title} - ANSA", "https://www.ansa.it/terremoto", "ANSA"),
+        _article(f"{title} - Corriere della Sera", "https://www.corriere.it/terremoto?utm_source=rss", "Corriere della Sera"),
+        _article("Terremoto in Calabria: scossa di magnitudo 4.2 avvertita a Cosenza - RaiNews", "https://www.rainews.it/a", "RaiNews"),
+    ]
+    deduped = dedupe_articles(articles)
+    assert len(deduped) == 1
+    assert deduped[0]['source_count'] == 3
+    assert deduped[0]['link'] == "https://www.ansa.it/terremoto"
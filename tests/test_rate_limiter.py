@@ -0,0 +1,24 @@
+import threading
+import time
+
+from news_agent.rate_limiter import DomainRateLimiter
+
+def test_cancelled_acquire_skips_request_and_refunds_token():
+    limiter = DomainRateLimiter(rate=1, burst=1)
+    assert limiter.acquire("https://scholar.google.com/a") == 0.0
+    
+    cancel_event = threading.Event()
+    threading.Timer(0.05, cancel_event.set).start()
+    started = time.monotonic()
+    assert limiter.acquire("https://scholar.google.com/b", cancel_event) is None
+    assert time.monotonic() - started < 0.5
+    
+    # Il token prenotato dalla richiesta annullata torna disponibile: nessuna coda in più
+    bucket = limiter._bucket("scholar.google.com")
+    assert -0.1 < bucket.tokens <= 0.1
+    assert limiter.acquire("https://scholar.google.com/c", cancel_event) is None
+
+def test_acquire_without_event_still_waits():
+    limiter = DomainRateLimiter(rate=20, burst=1)
+    limiter.acquire("https://example.org/a")
+    assert limiter.acquire("https://example.org/b") > 0
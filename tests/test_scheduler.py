@@ -0,0 +1,47 @@
+from unittest import mock
+
+from news_agent import scheduler as scheduler_module
+from news_agent.scheduler import FeedScheduler
+
+TITLE = "Terremoto in Calabria, scossa di magnitudo 4.2 avvertita a Cosenza"
+
+def _article(title, link, source):
+    return {'title': title, 'link': link, 'summary': '', 'source': source, 'date': ''}
+
+def _poll(feed_scheduler, articles):
+    with mock.patch.object(scheduler_module, 'fetch_feed', return_value=articles):
+        feed_scheduler.poll(next(iter(feed_scheduler.states.values())))
+
+def test_later_poll_folds_into_known_story():
+    delivered, updates = [], []
+    feed_scheduler = FeedScheduler(delivered.extend, sources=["https://example.it/rss"],
+                                   on_story_updates=updates.extend)
+    _poll(feed_scheduler, [_article(f"{TITLE} - ANSA", "https://www.ansa.it/terremoto", "ANSA")])
+    _poll(feed_scheduler, [_article(f"{TITLE} - Corriere della Sera", "https://www.corriere.it/terremoto", "Corriere della Sera")])
+    
+    assert len(delivered) == 1
+    assert updates == [{'link': "https://www.ansa.it/terremoto", 'sources': ["ANSA", "Corriere della Sera"], 'source_count': 2}]
+
+def test_seeded_articles_are_matched_by_fingerprint():
+    delivered, updates = [], []
+    feed_scheduler = FeedScheduler(delivered.extend, sources=["https://example.it/rss"],
+                                   on_story_updates=updates.extend)
+    feed_scheduler.seed([_article(f"{TITLE} - ANSA", "https://www.ansa.it/terremoto", "ANSA")])
+    feed_scheduler._index_seed()
+    _poll(feed_scheduler, [
+        _article(f"{TITLE} - RaiNews", "https://www.rainews.it/terremoto?utm_source=rss", "RaiNews"),
+        _article("Lotto: estratto il 7", "https://example.it/lotto/7", "Lotto"),
+    ])
+    
+    assert [article['title'] for article in delivered] == ["Lotto: estratto il 7"]
+    assert updates[0]['sources'] == ["ANSA", "RaiNews"]
+
+def test_selection_follows_article_after_refresh():
+    from news_agent.main import find_article
+    
+    articles = [_article(f"Notizia {n}", f"https://example.it/{n}", "ANSA") for n in range(5)]
+    selected_link = articles[2]['link']
+    # Il daemon inserisce due notizie in testa dopo l'ultimo disegno della tabella
+    articles[:] = [_article("Nuova A", "https://example.it/a", "ANSA"), _article("Nuova B", "https://example.it/b", "ANSA")] + articles
+    assert find_article(articles, selected_link, 2) == 4
+    assert find_article(articles, "https://example.it/rimossa", 9) == len(articles) - 1
@@ -0,0 +1,24 @@
+from news_agent.html_parser import parse_html
+from news_agent.scientific_study_scraper import ScientificStudyScraper
+
+SENTENCE = "Ancient DNA from the victims of Pompeii shows a mixed population of recent migrants. "
+
+PAGE = f"""<html><body><main><h1 class="article-title">Ancient genomes from Pompeii</h1>
+<div class="abstract"><p>{SENTENCE * 2}</p></div>
+<h2>Methods</h2><p>{SENTENCE * 3}</p>
+<h2>Results</h2><p>{SENTENCE * 3}</p>
+<h2>References</h2><p>{"Rossi M. et al. (2020) Journal of Genetics 12: 1-10. " * 3}</p>
+</main></body></html>"""
+
+def test_full_text_starts_with_abstract_without_its_own_heading():
+    study = ScientificStudyScraper()._parse_study_html("https://example.org/study", PAGE.encode('utf-8'))
+    assert study['abstract'].startswith("Ancient DNA")
+    assert study['full_text'].startswith("Abstract: Ancient DNA")
+    assert study['full_text'].count(SENTENCE.strip()) == 8
+    assert "Methods: " in study['full_text'] and "Journal of Genetics" not in study['full_text']
+
+def test_budgeted_text_stops_at_budget():
+    index = ScientificStudyScraper()._build_index(parse_html(PAGE))
+    text = index.budgeted_text(120, priority=(('method',), ('result',)), lead="Abstract: " + SENTENCE)
+    assert len(text) <= 120
+    assert text.startswith("Abstract: Ancient DNA")
@@ -0,0 +1,23 @@
+from news_agent.feed_cache import FeedCache
+from news_agent.storage import load_json, process_singleton, save_json
+
+def test_json_round_trip_and_corrupt_file(tmp_path):
+    path = tmp_path / "state.json"
+    assert load_json(path) == {}
+    save_json(path, {'ansa.it': {'hits': 2}})
+    assert load_json(path) == {'ansa.it': {'hits': 2}}
+    assert not path.with_suffix('.tmp').exists()
+    
+    path.write_text("{non è json", encoding='utf-8')
+    assert load_json(path) == {}
+
+def test_feed_cache_survives_reload(tmp_path):
+    path = tmp_path / "feed_cache.json"
+    FeedCache(path).store("https://example.it/rss", '"v1"', None, [{'title': "Notizia", 'link': "https://example.it/1"}])
+    cache = FeedCache(path)
+    assert cache.conditional_headers("https://example.it/rss") == {'If-None-Match': '"v1"'}
+    assert cache.get_articles("https://example.it/rss")[0]['title'] == "Notizia"
+
+def test_process_singleton_creates_one_instance():
+    get_instance = process_singleton(object)
+    assert get_instance() is get_instance()
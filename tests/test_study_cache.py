@@ -0,0 +1,26 @@
+from news_agent.study_cache import StudyCache
+
+STUDY = {
+    'title': "Effects of coffee on sleep quality",
+    'authors': ["Rossi, Mario"],
+    'doi': "10.1234/journal.2024.001",
+}
+QUALITY = {'score': 7, 'max_score': 10}
+
+def test_requested_doi_is_an_alias_of_the_page_doi(tmp_path):
+    cache = StudyCache(tmp_path / "studies.db")
+    assert cache.put(STUDY, QUALITY, dois=["https://doi.org/10.5555/PREPRINT.42"])
+    
+    for doi in ("10.1234/journal.2024.001", "10.5555/preprint.42"):
+        record = cache.get(doi=doi)
+        assert record['study_info']['title'] == STUDY['title']
+    assert cache.get(title=STUDY['title'], first_author="Mario Rossi")['quality'] == QUALITY
+    cache.close()
+
+def test_requested_doi_is_the_key_when_the_page_has_none(tmp_path):
+    cache = StudyCache(tmp_path / "studies.db")
+    study = dict(STUDY, doi="DOI non trovato", authors=["Autori non trovati"])
+    assert not cache.put(study, QUALITY)
+    assert cache.put(study, QUALITY, dois=["10.1234/journal.2024.001"])
+    assert cache.get(doi="10.1234/JOURNAL.2024.001")['quality'] == QUALITY
+    cache.close()
@@ -0,0 +1,8 @@
+from news_agent.scientific_study_scraper import ScientificStudyScraper
+
+def test_rank_candidate_ignores_blank_author():
+    scraper = ScientificStudyScraper()
+    candidate = {'url': "https://www.nature.com/articles/x", 'title': "Coffee and sleep", 'byline': "M Rossi - Nature"}
+    assert scraper._rank_candidate(candidate, study_name="coffee sleep", author_name="   ") == \
+        scraper._rank_candidate(candidate, study_name="coffee sleep")
+    assert scraper._rank_candidate(candidate, author_name="Mario Rossi") > scraper._rank_candidate(candidate, author_name="")